@@ -0,0 +1,13 @@
+"""PyQL benchmarks
+
+Each module can be run on its own, eg::
+
+    python -m benchmarks.containers
+
+``benchmarks.suite`` runs the general compile time / execution
+throughput benchmarks, and can compare results with a previous run::
+
+    python -m benchmarks.suite --output baseline.json
+    # ... make changes ...
+    python -m benchmarks.suite --baseline baseline.json
+"""
@@ -0,0 +1,78 @@
+"""Memory usage and construction rate of container objects
+
+Compares the default (dict-based) container types with the compact
+ones, generated by passing ``slots=True`` to ``Object``.
+
+Usage::
+
+    python -m benchmarks.containers [--fields 10] [--count 100000]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from pyql import Object
+
+
+def make_objects(num_fields):
+    fields = {"field_{}".format(i): str for i in range(num_fields)}
+    return {
+        "dict": Object("DictObject", fields),
+        "slots": Object("SlotsObject", fields, slots=True),
+    }
+
+
+def measure_memory(obj, values, count):
+    container_type = obj.container_type
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [container_type(**values) for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del instances
+    return (after - before) / count
+
+
+def measure_rate(obj, values, count):
+    container_type = obj.container_type
+    start = time.perf_counter()
+    for _ in range(count):
+        container_type(**values)
+    return count / (time.perf_counter() - start)
+
+
+def run(num_fields=10, count=100000):
+    values = {"field_{}".format(i): "value" for i in range(num_fields)}
+    results = {}
+    for label, obj in make_objects(num_fields).items():
+        results[label] = {
+            "bytes_per_instance": measure_memory(obj, values, count),
+            "instances_per_second": measure_rate(obj, values, count),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fields", type=int, default=10)
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    results = run(args.fields, args.count)
+
+    print("{} fields, {} instances".format(args.fields, args.count))
+    for label, result in results.items():
+        print(
+            "{:>6}: {:8.1f} bytes/instance {:12,.0f} instances/s".format(
+                label, result["bytes_per_instance"], result["instances_per_second"]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
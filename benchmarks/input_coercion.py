@@ -0,0 +1,115 @@
+"""Coercion of large lists of input objects
+
+Measures how long it takes to coerce a list of input objects (as
+passed in a variable of a bulk mutation) to a list of containers.
+
+The "legacy" variant re-creates the approach used before input
+fields had an out_name: rename keys with a dict comprehension, then
+call the container type with keyword arguments.
+
+Usage::
+
+    python -m benchmarks.input_coercion [--sizes 10000 100000]
+"""
+
+import argparse
+import time
+
+from graphql import GraphQLInputField, GraphQLInputObjectType, GraphQLList
+from graphql.utilities import coerce_input_value
+
+from pyql import InputObject, NonNull
+from pyql.schema.compile import GraphQLCompiler
+
+FIELDS = {
+    "item_name": NonNull(str),
+    "item_count": int,
+    "unit_price": float,
+    "description": str,
+    "is_active": bool,
+}
+
+
+def make_legacy_type(obj, compiled):
+    gql_to_python = {name: field.out_name for name, field in compiled.fields.items()}
+
+    def create_container(arg):
+        return obj.container_type(
+            **{gql_to_python[name]: value for name, value in arg.items()}
+        )
+
+    fields = {
+        name: GraphQLInputField(
+            field.type, default_value=field.default_value, out_name=None
+        )
+        for name, field in compiled.fields.items()
+    }
+    return GraphQLInputObjectType(
+        compiled.name + "Legacy", fields, out_type=create_container
+    )
+
+
+def make_types():
+    compiler = GraphQLCompiler()
+    dict_input = InputObject("ItemInput", FIELDS)
+    slots_input = InputObject("SlotsItemInput", FIELDS, slots=True)
+    dict_compiled = compiler.compile_input_object(dict_input)
+    return {
+        "legacy": make_legacy_type(dict_input, dict_compiled),
+        "dict": dict_compiled,
+        "slots": compiler.compile_input_object(slots_input),
+    }
+
+
+def make_value(size):
+    return [
+        {
+            "itemName": "Item {}".format(i),
+            "itemCount": i,
+            "unitPrice": 1.5,
+            "description": "Lorem ipsum",
+            "isActive": True,
+        }
+        for i in range(size)
+    ]
+
+
+def measure(input_type, value, repeat=3):
+    list_type = GraphQLList(input_type)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        coerce_input_value(value, list_type)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(sizes=(10000, 100000)):
+    types = make_types()
+    results = {}
+    for size in sizes:
+        value = make_value(size)
+        results[size] = {
+            label: measure(input_type, value) for label, input_type in types.items()
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    for size, result in run(args.sizes).items():
+        print("{:,} items".format(size))
+        for label, elapsed in result.items():
+            print(
+                "{:>8}: {:8.3f} s {:12,.0f} items/s".format(
+                    label, elapsed, size / elapsed
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
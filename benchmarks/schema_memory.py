@@ -0,0 +1,61 @@
+"""Memory used by schema definitions, and by compiled schemas
+
+Builds a synthetic schema, measuring actual allocations with
+tracemalloc, and compares them with the estimate returned by
+``Schema.memory_info()``.
+
+Usage::
+
+    python -m benchmarks.schema_memory [--types 1000] [--fields 10]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.wrapper_types import make_schema
+
+
+def measure_allocations(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, allocated
+
+
+def run(num_types=1000, num_fields=10):
+    # Make sure imports are not counted
+    make_schema(1, 1).compiled
+
+    schema, definition = measure_allocations(lambda: make_schema(num_types, num_fields))
+    _, compiled = measure_allocations(lambda: schema.compiled)
+
+    return {
+        "measured": {"definition": definition, "compiled": compiled},
+        "estimated": schema.memory_info(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--types", type=int, default=1000)
+    parser.add_argument("--fields", type=int, default=10)
+    args = parser.parse_args()
+
+    results = run(args.types, args.fields)
+
+    print("{} types, {} fields each".format(args.types, args.fields * 2))
+    for label, result in results.items():
+        print(
+            "{:>10}: definition {:8.2f} MiB, compiled {:8.2f} MiB".format(
+                label, result["definition"] / 2**20, result["compiled"] / 2**20
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
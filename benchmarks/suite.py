@@ -0,0 +1,246 @@
+"""Benchmark suite: schema compile time and execution throughput
+
+Runs a set of benchmarks against a synthetic schema (see
+``benchmarks.synthetic``), and optionally writes results to a JSON
+file, or compares them against a previous run.
+
+Benchmarks:
+
+- ``compile`` / ``compile_lazy``: time to compile the schema
+- ``execute_wide``: all the fields of all the types
+- ``execute_deep``: deeply nested objects
+- ``execute_list``: a large list of objects
+- ``execute_introspection``: the standard introspection query
+- ``result_memory``: memory allocated per result of ``execute_list``
+- ``tracing_overhead``: ``execute_list`` on a schema compiled with
+  tracing (but no request sampled), relative to ``execute_list``
+
+Usage::
+
+    python -m benchmarks.suite [--types 100] [--fields 10] [--depth 20]
+        [--list-size 1000] [--output results.json]
+        [--baseline baseline.json] [--threshold 0.1]
+
+When comparing against a baseline, the exit status is 1 if any result
+got worse by more than the threshold (10% by default).
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import graphql
+from graphql import get_introspection_query
+
+from benchmarks.synthetic import (
+    make_deep_query,
+    make_list_query,
+    make_schema,
+    make_wide_query,
+)
+from pyql.schema.compile import GraphQLCompiler
+
+FORMAT_VERSION = 1
+
+# Whether higher values are better, by unit
+HIGHER_IS_BETTER = {
+    "seconds": False,
+    "executions_per_second": True,
+    "bytes_per_result": False,
+    "ratio": False,
+}
+
+
+def best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure_compile(schema, repeat, **options):
+    return best_time(lambda: GraphQLCompiler(**options).compile_schema(schema), repeat)
+
+
+def _execution_rate(schema, query, min_time):
+    count = 0
+    start = time.perf_counter()
+    while True:
+        schema.execute(query)
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return count / elapsed
+
+
+def measure_throughput(schemas, query, min_time=0.5, repeat=3):
+    """Executions per second of a query, on each of the schemas
+
+    Rounds for different schemas are interleaved, so that they're
+    equally affected by noise; the best of ``repeat`` rounds is taken.
+    """
+
+    for schema in schemas:
+        result = schema.execute(query)  # Compile, warm up caches
+        assert result.errors is None, result.errors
+
+    best = [0] * len(schemas)
+    for _ in range(repeat):
+        for i, schema in enumerate(schemas):
+            best[i] = max(best[i], _execution_rate(schema, query, min_time))
+    return best
+
+
+def measure_result_memory(schema, query, count=10):
+    """Memory allocated for each result (kept alive) of a query"""
+
+    schema.execute(query)  # Compile, warm up caches
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        results = [schema.execute(query) for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del results
+    return (after - before) / count
+
+
+def run(num_types=100, num_fields=10, depth=20, list_size=1000, repeat=5):
+    schema = make_schema(num_types, num_fields)
+    traced_schema = make_schema(num_types, num_fields, tracing=True)
+    traced_schema.tracing_sample_rate = 0
+
+    list_query = make_list_query(num_fields, list_size)
+
+    results = {
+        "compile": {"seconds": measure_compile(schema, repeat)},
+        "compile_lazy": {"seconds": measure_compile(schema, repeat, lazy=True)},
+    }
+
+    queries = {
+        "execute_wide": make_wide_query(num_types, num_fields),
+        "execute_deep": make_deep_query(num_fields, depth),
+        "execute_list": list_query,
+        "execute_introspection": get_introspection_query(),
+    }
+    for name, query in queries.items():
+        (rate,) = measure_throughput([schema], query, repeat=repeat)
+        results[name] = {"executions_per_second": rate}
+
+    results["result_memory"] = {
+        "bytes_per_result": measure_result_memory(schema, list_query)
+    }
+
+    plain, traced = measure_throughput(
+        [schema, traced_schema], list_query, min_time=0.2, repeat=repeat
+    )
+    results["tracing_overhead"] = {"ratio": plain / traced}
+
+    return results
+
+
+def get_metadata(args):
+    return {
+        "format": FORMAT_VERSION,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "graphql_core": graphql.version,
+        "parameters": {
+            "types": args.types,
+            "fields": args.fields,
+            "depth": args.depth,
+            "list_size": args.list_size,
+        },
+    }
+
+
+def compare(results, baseline, threshold):
+    """Compare results against a baseline
+
+    Returns:
+        list of ``(benchmark, unit, baseline value, value, change,
+        regressed)`` tuples, where ``change`` is the relative change
+        (positive meaning better).
+    """
+
+    rows = []
+    for name, values in results.items():
+        for unit, value in values.items():
+            try:
+                base = baseline[name][unit]
+            except KeyError:
+                continue
+            if HIGHER_IS_BETTER[unit]:
+                change = value / base - 1
+            else:
+                change = base / value - 1
+            rows.append((name, unit, base, value, change, change < -threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--types", type=int, default=100)
+    parser.add_argument("--fields", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--list-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare with results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = run(args.types, args.fields, args.depth, args.list_size, args.repeat)
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(
+                {"meta": get_metadata(args), "results": results},
+                fp,
+                indent=2,
+                sort_keys=True,
+            )
+
+    if not args.baseline:
+        print(
+            "{} types, {} fields each, depth {}, {} list items".format(
+                args.types, args.fields, args.depth, args.list_size
+            )
+        )
+        for name, values in results.items():
+            for unit, value in values.items():
+                print("{:>18}: {:14,.4f} {}".format(name, value, unit))
+        return
+
+    with open(args.baseline) as fp:
+        baseline = json.load(fp)
+
+    if baseline["meta"]["parameters"] != get_metadata(args)["parameters"]:
+        print("Warning: baseline was run with different parameters")
+
+    regressions = 0
+    for name, unit, base, value, change, regressed in compare(
+        results, baseline["results"], args.threshold
+    ):
+        regressions += regressed
+        print(
+            "{:>18}: {:14,.4f} -> {:14,.4f} {:<22} {:+7.1%}{}".format(
+                name, base, value, unit, change, "  REGRESSION" if regressed else ""
+            )
+        )
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Synthetic schemas and queries, of configurable size and shape
+
+The schema has ``num_types`` object types, each with ``num_fields``
+scalar fields, plus:
+
+- ``child``: the next type in its group of ``GROUP_SIZE`` types
+  (cycling back to the first one of the group), to build arbitrarily
+  deep queries;
+- ``children(first: Int)``: a list of ``first`` items of the same
+  type as ``child``, to build queries returning large lists.
+
+Types reference each other in groups, rather than in one long chain,
+so that compiling the schema doesn't recurse once per type.
+
+The query type has a ``typeN`` field for each type. Resolvers return
+the same (dict) item all over the place, so that execution time is
+spent in pyql / graphql-core rather than building data.
+"""
+
+from typing import List
+
+from pyql import Object, Schema
+
+SCALAR_TYPES = (str, int, float, bool)
+
+# Number of types referencing each other via ``child``
+GROUP_SIZE = 10
+
+
+def make_item(num_fields):
+    return {
+        "field_{}".format(j): SCALAR_TYPES[j % len(SCALAR_TYPES)](j)
+        for j in range(num_fields)
+    }
+
+
+def make_schema(num_types=100, num_fields=10, **kwargs):
+    """Make a synthetic schema
+
+    Args:
+        num_types: number of object types
+        num_fields: number of scalar fields per type
+        **kwargs: passed to the ``Schema`` constructor
+    """
+
+    item = make_item(num_fields)
+
+    objects = [
+        Object(
+            "Type{}".format(i),
+            fields={
+                "field_{}".format(j): SCALAR_TYPES[j % len(SCALAR_TYPES)]
+                for j in range(num_fields)
+            },
+        )
+        for i in range(num_types)
+    ]
+
+    Query = Object("Query")
+
+    for i, obj in enumerate(objects):
+        group_start = i - i % GROUP_SIZE
+        group_size = min(GROUP_SIZE, num_types - group_start)
+        next_obj = objects[group_start + (i + 1 - group_start) % group_size]
+
+        @obj.field("child")
+        def resolve_child(root, info) -> next_obj:
+            return item
+
+        @obj.field("children")
+        def resolve_children(root, info, first: int = 10) -> List[next_obj]:
+            return [item] * first
+
+        @Query.field("type{}".format(i))
+        def resolve_type(root, info) -> obj:
+            return item
+
+    return Schema(query=Query, **kwargs)
+
+
+def _scalar_fields(num_fields):
+    return " ".join("field{}".format(j) for j in range(num_fields))
+
+
+def make_wide_query(num_types, num_fields):
+    """Query all the scalar fields of all the types"""
+
+    return "{{ {} }}".format(
+        " ".join(
+            "type{} {{ {} }}".format(i, _scalar_fields(num_fields))
+            for i in range(num_types)
+        )
+    )
+
+
+def make_deep_query(num_fields, depth):
+    """Query ``depth`` levels of nested objects"""
+
+    query = _scalar_fields(num_fields)
+    for _ in range(depth - 1):
+        query = "child {{ {} }}".format(query)
+    return "{{ type0 {{ {} }} }}".format(query)
+
+
+def make_list_query(num_fields, size):
+    """Query a list of ``size`` objects"""
+
+    return "{{ type0 {{ children(first: {}) {{ {} }} }} }}".format(
+        size, _scalar_fields(num_fields)
+    )
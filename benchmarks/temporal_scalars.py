@@ -0,0 +1,133 @@
+"""Parsing and serialization of DateTime values
+
+Compares the DateTime scalar with the previous implementation, which
+parsed everything through aniso8601, and serialized list items one by
+one (with an ``isinstance()`` assertion each):
+
+- parsing a list of timestamps (as passed in a variable);
+- executing a query returning a list of timestamps.
+
+Usage::
+
+    python -m benchmarks.temporal_scalars [--sizes 10000 100000]
+"""
+
+import argparse
+import datetime
+import time
+from typing import List
+
+import aniso8601
+from graphql import ExecutionContext as DefaultExecutionContext
+from graphql import GraphQLScalarType, graphql_sync
+
+from pyql import Object, Schema
+from pyql.schema.compile import GraphQLCompiler
+from pyql.schema.execution import ExecutionContext
+from pyql.schema.types.extra import GraphQLDateTime
+
+
+def legacy_serialize(dt):
+    assert isinstance(
+        dt, (datetime.datetime, datetime.date)
+    ), 'Received not compatible datetime "{}"'.format(repr(dt))
+    return dt.isoformat()
+
+
+def legacy_parse_value(value):
+    try:
+        return aniso8601.parse_datetime(value)
+    except ValueError:
+        return None
+
+
+LegacyDateTime = GraphQLScalarType(
+    name="DateTime",
+    serialize=legacy_serialize,
+    parse_value=legacy_parse_value,
+)
+
+VARIANTS = {
+    "legacy": (LegacyDateTime, DefaultExecutionContext),
+    "fast": (GraphQLDateTime, ExecutionContext),
+}
+
+
+def make_values(size):
+    start = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    return [start + datetime.timedelta(seconds=i * 37) for i in range(size)]
+
+
+def make_schema(values):
+    Query = Object("Query")
+
+    @Query.field("timestamps")
+    def resolve_timestamps(root, info) -> List[datetime.datetime]:
+        return values
+
+    return Schema(query=Query)
+
+
+def best_time(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure_parse(scalar, strings):
+    parse_value = scalar.parse_value
+    return best_time(lambda: [parse_value(value) for value in strings])
+
+
+def measure_execute(scalar, execution_context_class, schema):
+    compiler = GraphQLCompiler(custom_types={datetime.datetime: scalar})
+    compiled = compiler.compile_schema(schema)
+
+    def execute():
+        result = graphql_sync(
+            compiled,
+            "{ timestamps }",
+            execution_context_class=execution_context_class,
+        )
+        assert result.errors is None
+
+    return best_time(execute)
+
+
+def run(sizes=(10000, 100000)):
+    results = {}
+    for size in sizes:
+        values = make_values(size)
+        strings = [value.isoformat() for value in values]
+        schema = make_schema(values)
+        results[size] = {
+            label: {
+                "parse": measure_parse(scalar, strings),
+                "execute": measure_execute(scalar, context_class, schema),
+            }
+            for label, (scalar, context_class) in VARIANTS.items()
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    for size, result in run(args.sizes).items():
+        print("{:,} timestamps".format(size))
+        for label, timings in result.items():
+            print(
+                "{:>8}: parse {:8.3f} s   execute {:8.3f} s".format(
+                    label, timings["parse"], timings["execute"]
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
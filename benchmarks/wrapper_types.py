@@ -0,0 +1,101 @@
+"""Memory used by wrapping types (non-null, list) in compiled schemas
+
+Compiles a synthetic schema, where most fields and arguments are
+non-null and/or lists, with and without sharing of wrapping type
+instances.
+
+Usage::
+
+    python -m benchmarks.wrapper_types [--types 1000] [--fields 10]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from typing import List
+
+from graphql import GraphQLList, GraphQLNonNull
+
+from pyql import NonNull, Object, Schema
+from pyql.schema.compile import GraphQLCompiler
+
+
+class NonSharingCompiler(GraphQLCompiler):
+    """Compiler creating a new wrapping type every time"""
+
+    def wrap_type(self, wrapper_type, of_type):
+        return wrapper_type(of_type)
+
+
+def make_schema(num_types, num_fields):
+    Query = Object("Query")
+
+    for i in range(num_types):
+        fields = {}
+        for j in range(num_fields):
+            fields["id_{}".format(j)] = NonNull(int)
+            fields["tags_{}".format(j)] = List[str]
+        obj = Object("Type{}".format(i), fields=fields)
+
+        @Query.field("get_type_{}".format(i))
+        def resolve(root, info, item_id: int, tags: List[str]) -> NonNull(obj):
+            return None
+
+    return Schema(query=Query)
+
+
+def count_wrappers(compiled):
+    seen = set()
+
+    def visit(type_):
+        while isinstance(type_, (GraphQLNonNull, GraphQLList)):
+            seen.add(id(type_))
+            type_ = type_.of_type
+
+    for named_type in compiled.type_map.values():
+        for field in getattr(named_type, "fields", {}).values():
+            visit(field.type)
+            for arg in getattr(field, "args", {}).values():
+                visit(arg.type)
+
+    return len(seen)
+
+
+def measure(compiler_class, schema):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        compiled = compiler_class().compile_schema(schema)
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return {"bytes": allocated, "wrappers": count_wrappers(compiled)}
+
+
+def run(num_types=1000, num_fields=10):
+    schema = make_schema(num_types, num_fields)
+    return {
+        "not_shared": measure(NonSharingCompiler, schema),
+        "shared": measure(GraphQLCompiler, schema),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--types", type=int, default=1000)
+    parser.add_argument("--fields", type=int, default=10)
+    args = parser.parse_args()
+
+    results = run(args.types, args.fields)
+
+    print("{} types, {} fields each".format(args.types, args.fields * 2))
+    for label, result in results.items():
+        print(
+            "{:>10}: {:8.2f} MiB {:8} wrapping types".format(
+                label, result["bytes"] / 2**20, result["wrappers"]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,34 @@
-# flake8: noqa
-
-from pyql.schema.types.core import (
-    ID,
-    InputObject,
-    Interface,
-    NonNull,
-    Object,
-    Schema,
-    Union,
-)
+# The public API is loaded lazily (see PEP 562), so that ``import pyql``
+# stays cheap; graphql-core in particular is only imported once a
+# schema is compiled.
+
+_EXPORTS = {
+    "BigInt": "pyql.schema.types.core",
+    "ID": "pyql.schema.types.core",
+    "InputObject": "pyql.schema.types.core",
+    "Interface": "pyql.schema.types.core",
+    "JSON": "pyql.schema.types.core",
+    "NonNull": "pyql.schema.types.core",
+    "Object": "pyql.schema.types.core",
+    "Schema": "pyql.schema.types.core",
+    "Union": "pyql.schema.types.core",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module_name = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # Skip __getattr__ next time
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
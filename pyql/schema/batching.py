@@ -0,0 +1,220 @@
+"""Batching of resolver calls
+
+Resolvers for fields defined with a ``batch_key`` (or via
+``Object.batch_field()``) don't return values directly. Instead, they
+register the key (or the root object itself) to be loaded with a
+``DataLoader``, and return a future. All the keys registered during
+the same iteration of the event loop are then passed, at once, to the
+batch resolver.
+
+Loaders are request-scoped: they live in a ``LoaderRegistry``, which
+is activated for the duration of each execution by
+``Schema.execute()`` / ``Schema.execute_async()``.
+
+Each loader is specific to a field, its arguments, and the query
+fields (``info.field_nodes``) being resolved, so that all the keys in
+a batch share the same selection. The ``info`` passed to the batch
+resolver is the one of the first key in the batch: its ``path``
+points to that key only.
+"""
+
+import asyncio
+import contextvars
+from inspect import isawaitable
+
+from pyql.schema.types.core import make_default_resolver
+
+_current_registry = contextvars.ContextVar("pyql_loader_registry", default=None)
+
+
+class DataLoader:
+    """Collect keys to be loaded, and load them in a single batch
+
+    Args:
+        batch_fn:
+            function accepting a list of keys, and returning a list of
+            values (or an awaitable resolving to it) in the same order.
+            Values that are exceptions are raised to the respective
+            callers.
+        cache:
+            if True (the default), keys are de-duplicated and results
+            cached. Set to False to support unhashable keys.
+    """
+
+    def __init__(self, batch_fn, cache=True):
+        self.batch_fn = batch_fn
+        self._cache = {} if cache else None
+        self._queue = []
+        # Tasks awaiting batch functions: the event loop only keeps
+        # weak references to them
+        self._tasks = set()
+
+    def load(self, key):
+        """Request loading a key
+
+        Returns:
+            a future, resolving to the value for the given key.
+        """
+
+        cache = self._cache
+        if cache is not None:
+            try:
+                return cache[key]
+            except KeyError:
+                pass
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if cache is not None:
+            cache[key] = future
+
+        if not self._queue:
+            loop.call_soon(self.dispatch)
+        self._queue.append((key, future))
+
+        return future
+
+    def dispatch(self):
+        """Call the batch function for all the queued keys"""
+
+        queue, self._queue = self._queue, []
+        if not queue:
+            return
+
+        try:
+            values = self.batch_fn([key for key, _ in queue])
+        except Exception as e:
+            _fail_all(queue, e)
+            return
+
+        if isawaitable(values):
+            task = asyncio.ensure_future(self._complete_async(queue, values))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            self._complete(queue, values)
+
+    async def _complete_async(self, queue, values):
+        try:
+            values = await values
+        except Exception as e:
+            _fail_all(queue, e)
+            return
+        self._complete(queue, values)
+
+    def _complete(self, queue, values):
+        values = list(values)
+
+        if len(values) != len(queue):
+            _fail_all(
+                queue,
+                ValueError(
+                    "Batch resolver must return a list with one value per "
+                    "key (expected {}, got {})".format(len(queue), len(values))
+                ),
+            )
+            return
+
+        for (key, future), value in zip(queue, values):
+            if future.done():  # Cancelled
+                continue
+            if isinstance(value, Exception):
+                future.set_exception(value)
+            else:
+                future.set_result(value)
+
+
+def _fail_all(queue, error):
+    for key, future in queue:
+        if not future.done():
+            future.set_exception(error)
+
+
+class LoaderRegistry:
+    """Request-scoped collection of data loaders
+
+    Can be used as a context manager, to activate the registry while
+    executing a query outside of ``Schema.execute()``, eg::
+
+        with LoaderRegistry():
+            result = await graphql(schema.compiled, query)
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._tokens = []
+
+    def get_loader(self, key, batch_fn, cache=True):
+        """Get the loader for a key, creating it if needed"""
+
+        try:
+            return self._loaders[key]
+        except KeyError:
+            loader = self._loaders[key] = DataLoader(batch_fn, cache=cache)
+            return loader
+
+    def __enter__(self):
+        self._tokens.append(_current_registry.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        _current_registry.reset(self._tokens.pop())
+
+
+def get_loader_registry():
+    """Return the currently active loader registry, if any"""
+
+    return _current_registry.get()
+
+
+def make_batch_resolver(field):
+    """Make a resolver, loading values through the field batch resolver"""
+
+    batch_key = field.batch_key
+    batch_resolver = field.resolver
+
+    # Level-wide batching passes root objects (which might well be
+    # unhashable) to the batch resolver as they are.
+    cache = not field.batch_roots
+
+    if field.batch_roots:
+        get_key = None
+    elif isinstance(batch_key, str):
+        get_key = make_default_resolver(batch_key)
+    else:
+
+        def get_key(root, info):
+            return batch_key(root)
+
+    def resolver(root, info, **kwargs):
+        if get_key is None:
+            key = root
+        else:
+            key = get_key(root, info)
+            if key is None:
+                return None
+
+        def batch_fn(keys):
+            return batch_resolver(keys, info, **kwargs)
+
+        registry = _current_registry.get()
+        if registry is None:
+            # Not running inside a registry: no batching possible.
+            return DataLoader(batch_fn, cache=cache).load(key)
+
+        try:
+            # Field nodes are keyed by identity: hashing AST nodes would
+            # walk the whole sub-tree.
+            loader_key = (
+                field,
+                tuple(map(id, info.field_nodes)),
+                tuple(sorted(kwargs.items())),
+            )
+            hash(loader_key)
+        except TypeError:
+            # Unhashable argument values: cannot share the loader.
+            return DataLoader(batch_fn, cache=cache).load(key)
+
+        return registry.get_loader(loader_key, batch_fn, cache=cache).load(key)
+
+    return resolver
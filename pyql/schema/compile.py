@@ -1,7 +1,11 @@
 import datetime
+import decimal
 import functools
+import inspect
 import typing
+import uuid
 from enum import Enum
+from types import FunctionType
 from typing import Any, Callable
 
 import graphql
@@ -21,11 +25,17 @@ from graphql import (
     GraphQLSchema,
     GraphQLString,
     GraphQLUnionType,
+    default_type_resolver,
 )
 
+from pyql.schema.batching import make_batch_resolver
+from pyql.schema.naming import get_naming_strategy
+from pyql.schema.tracing import make_traced_resolver
 from pyql.schema.types.core import (
     ID,
+    JSON,
     Argument,
+    BigInt,
     Field,
     InputField,
     InputObject,
@@ -38,13 +48,23 @@ from pyql.schema.types.core import (
     Union,
 )
 from pyql.schema.types.enum_type import GraphQLEnumType
-from pyql.schema.types.extra import GraphQLDate, GraphQLDateTime, GraphQLTime
-from pyql.utils.str_converters import to_camel_case
+from pyql.schema.types.extra import (
+    GraphQLBigInt,
+    GraphQLBytes,
+    GraphQLDate,
+    GraphQLDateTime,
+    GraphQLDecimal,
+    GraphQLJSON,
+    GraphQLTime,
+    GraphQLUUID,
+)
 
 
 def compile_schema(schema: Schema) -> GraphQLSchema:
-    return GraphQLCompiler().compile_schema(schema)
+    return GraphQLCompiler.for_schema(schema).compile_schema(schema)
+
 
+_ASYNC_CODE_FLAGS = inspect.CO_COROUTINE | inspect.CO_ASYNC_GENERATOR
 
 DEFAULT_TYPE_MAP = {
     str: GraphQLString,
@@ -55,21 +75,106 @@ DEFAULT_TYPE_MAP = {
     datetime.datetime: GraphQLDateTime,
     datetime.date: GraphQLDate,
     datetime.time: GraphQLTime,
-    # TODO: support JSONString too? (Like Graphene does)
-    # TODO: Provide an API to extend this mapping (?)
+    uuid.UUID: GraphQLUUID,
+    decimal.Decimal: GraphQLDecimal,
+    bytes: GraphQLBytes,
+    JSON: GraphQLJSON,
+    BigInt: GraphQLBigInt,
 }
+# Extend with Schema(scalars=...) or Schema.register_scalar()
 
 
 class GraphQLCompiler:
 
     # We need to use a class here to keep local state (objects cache)
 
-    def __init__(self, custom_types=None):
+    def __init__(
+        self,
+        custom_types=None,
+        lazy=False,
+        strict_types=True,
+        tracing=False,
+        naming=None,
+    ):
         self._cache = {}
+
+        # Wrapping types (non-null, list), keyed by (wrapper class,
+        # wrapped type), so that identical types share one instance.
+        self._wrappers = {}
+
+        # If set, field maps are only compiled when first accessed
+        # (see pyql.schema.lazy)
+        self.lazy = lazy
+
+        # Number of types whose fields have been compiled
+        self.compiled_types = 0
+
+        # (definition, version) pairs for the objects, interfaces and
+        # input objects compiled (or indexed, in lazy mode), so schemas
+        # can tell whether they changed since (see Schema.compiled)
+        self.definitions = []
+
+        # Functions compiling the fields of types created, but not
+        # completed yet (see _complete_type())
+        self._pending = []
+        self._completing = False
+
+        # If unset, objects get no default is_type_of check, saving a
+        # call for every object resolved (see _make_is_type_of())
+        self.strict_types = strict_types
+
+        # If set, resolvers are wrapped to record their timings (see
+        # pyql.schema.tracing)
+        self.tracing = tracing
+
+        # Converts names of fields, arguments and input fields to
+        # GraphQL (see pyql.schema.naming)
+        self.naming = get_naming_strategy(naming)
+
+        # Maps Python classes (container types, and classes registered
+        # via Object.register_class()) to names of the GraphQL types
+        # they belong to, to resolve abstract types with no custom
+        # resolve_type (see _make_resolve_type()).
+        self.type_registry = {}
+        self._objects = {}
+
+        # Set as soon as a coroutine function is found among resolvers,
+        # meaning the schema can only be executed asynchronously.
+        self.has_async_resolvers = False
+
         self._type_map = dict(DEFAULT_TYPE_MAP)
         if custom_types:
             self._type_map.update(custom_types)
 
+    @classmethod
+    def for_schema(cls, schema: Schema) -> "GraphQLCompiler":
+        """Create a compiler, configured from the schema options"""
+        return cls(
+            lazy=schema.lazy,
+            strict_types=schema.strict_types,
+            tracing=schema.tracing,
+            custom_types=schema.scalars,
+            naming=schema.naming,
+        )
+
+    def _check_async(self, fn):
+        if fn is None or self.has_async_resolvers:
+            return
+        if type(fn) is FunctionType and not fn.__dict__:
+            # Plain function: just check the code flags (this is what
+            # the inspect functions end up doing, only much faster)
+            is_async = fn.__code__.co_flags & _ASYNC_CODE_FLAGS
+        else:
+            is_async = inspect.iscoroutinefunction(fn) or inspect.isasyncgenfunction(fn)
+        if is_async:
+            self.has_async_resolvers = True
+
+    def _check_async_field(self, field):
+        self._check_async(field.resolver)
+        if field.is_batched:
+            # Batch resolvers return futures, so we need an event loop
+            self.has_async_resolvers = True
+
     def get_from_cache(self, obj):
         return self._cache.get(obj)
 
@@ -88,6 +193,11 @@ class GraphQLCompiler:
         return wrapped
 
     def compile_schema(self, schema: Schema) -> GraphQLSchema:
+        if self.lazy:
+            from pyql.schema.lazy import LazyGraphQLSchema
+
+            return LazyGraphQLSchema(self, schema)
+
         return GraphQLSchema(
             query=self._compile_object_or_none(schema.query),
             mutation=self._compile_object_or_none(schema.mutation),
@@ -96,6 +206,26 @@ class GraphQLCompiler:
             types=self._compile_schema_types(schema.types),
         )
 
+    def _complete_type(self, complete):
+        """Call ``complete`` to compile the fields of a new type
+
+        Types reached while completing another one are completed by
+        the same loop, rather than recursively, so that long chains of
+        nested types don't exhaust the stack.
+        """
+
+        self._pending.append(complete)
+        if self._completing:
+            return
+
+        self._completing = True
+        try:
+            while self._pending:
+                self._pending.pop()()
+        finally:
+            self._completing = False
+            self._pending.clear()
+
     def _compile_object_or_none(self, obj):
         if obj is None:
             return None
@@ -116,17 +246,18 @@ class GraphQLCompiler:
     def compile_object(self, obj: Object) -> GraphQLObjectType:
         assert isinstance(obj, Object)
 
-        is_type_of = obj.is_type_of
-        if is_type_of is None:
+        self._register_object(obj)
+        is_type_of = self._make_is_type_of(obj)
 
-            def is_type_of(val, info):
-                # If it's an instance of a container type, it must be
-                # the correct one.
-                if isinstance(val, ObjectContainer):
-                    return isinstance(val, obj.container_type)
+        def compile_fields():
+            return self._compile_fields(obj.fields)
 
-                # Accept any other object
-                return True
+        def compile_interfaces():
+            return (
+                [self.compile_interface(x) for x in obj.interfaces]
+                if obj.interfaces
+                else []
+            )
 
         compiled_type = GraphQLObjectType(
             # Object names are in CamelCase both in Python and GraphQL,
@@ -134,8 +265,8 @@ class GraphQLCompiler:
             name=obj.name,
             is_type_of=is_type_of,
             description=obj.description,
-            fields={},  # placeholder
-            interfaces=[],  # placeholder
+            fields=compile_fields if self.lazy else {},  # placeholder
+            interfaces=compile_interfaces if self.lazy else [],  # placeholder
         )
 
         # Need to stick it into cache before we start compiling fields.
@@ -143,100 +274,193 @@ class GraphQLCompiler:
         # infinite recursion if there is a circular reference.
         self.add_to_cache(obj, compiled_type)
 
-        compiled_type.fields = {
-            _name_to_graphql(name): self.compile_field(field)
-            for name, field in obj.fields.items()
-        }
+        if not self.lazy:
+            self.definitions.append((obj, obj._version))
 
-        compiled_type.interfaces = (
-            [self.compile_interface(x) for x in obj.interfaces]
-            if obj.interfaces
-            else []
-        )
+            def complete():
+                compiled_type.fields = compile_fields()
+                compiled_type.interfaces = compile_interfaces()
+
+            self._complete_type(complete)
 
         return compiled_type
 
+    def _register_object(self, obj):
+        self._objects[obj.name] = obj
+        for cls in obj.registered_classes:
+            self.type_registry[cls] = obj.name
+
+    def _make_resolve_type(self, abstract):
+        resolve_type = abstract.resolve_type
+        self._check_async(resolve_type)
+        if resolve_type is not None:
+            return resolve_type
+
+        # graphql-core would call is_type_of() on all the possible
+        # types in turn. Instead, look up the value class directly.
+        type_registry = self.type_registry
+
+        def resolve_type(value, info, abstract_type):
+            try:
+                return type_registry[type(value)]
+            except KeyError:
+                pass
+            type_name = self._find_container_type(
+                type(value), info.schema, abstract_type
+            )
+            if type_name is None:
+                return self._resolve_other_type(value, info, abstract_type)
+            return type_name
+
+        return resolve_type
+
+    def _resolve_other_type(self, value, info, abstract_type):
+        type_name = default_type_resolver(value, info, abstract_type)
+        if type_name is None and not self.strict_types:
+            # Objects have no default is_type_of in this mode; accept
+            # the first one without a custom check, as it would have.
+            for type_ in info.schema.get_possible_types(abstract_type):
+                if type_.is_type_of is None:
+                    return type_.name
+        return type_name
+
+    def _find_container_type(self, cls, schema, abstract_type):
+        # Container types are only created when first needed, and we
+        # don't want to force that (as it freezes objects), so they
+        # are added to the registry as they're first seen.
+        if not issubclass(cls, ObjectContainer):
+            return None
+        for type_ in schema.get_possible_types(abstract_type):
+            obj = self._objects.get(type_.name)
+            if obj is not None and obj._container_type is cls:
+                self.type_registry[cls] = type_.name
+                return type_.name
+        return None
+
+    def _make_is_type_of(self, obj):
+        is_type_of = obj.is_type_of
+        self._check_async(is_type_of)
+        if is_type_of is None and self.strict_types:
+
+            def is_type_of(val, info):
+                # If it's an instance of a container type, it must be
+                # the correct one.
+                if isinstance(val, ObjectContainer):
+                    return isinstance(val, obj.container_type)
+
+                # Accept any other object
+                return True
+
+        return is_type_of
+
+    def _compile_fields(self, fields):
+        self.compiled_types += 1
+        to_graphql = self.naming.to_graphql
+        return {
+            to_graphql(name): self.compile_field(field)
+            for name, field in fields.items()
+        }
+
     @cache_compiled_object
     def compile_interface(self, obj: Interface) -> GraphQLInterfaceType:
         assert isinstance(obj, Interface)
+
+        def compile_fields():
+            return self._compile_fields(obj.fields)
+
         compiled_type = GraphQLInterfaceType(
             # Object names are in CamelCase both in Python and GraphQL,
             # so no need for conversion here.
             name=obj.name,
-            fields={},  # placeholder
-            # TODO: do we need to wrap this, so we can convert types
-            #       on the fly?
-            resolve_type=obj.resolve_type,
+            fields=compile_fields if self.lazy else {},  # placeholder
+            resolve_type=self._make_resolve_type(obj),
             description=obj.description,
         )
 
         self.add_to_cache(obj, compiled_type)
 
-        compiled_type.fields = {
-            _name_to_graphql(name): self.compile_field(field)
-            for name, field in obj.fields.items()
-        }
+        if not self.lazy:
+            self.definitions.append((obj, obj._version))
+
+            def complete():
+                compiled_type.fields = compile_fields()
+
+            self._complete_type(complete)
 
         return compiled_type
 
     @cache_compiled_object
     def compile_field(self, field: Field) -> GraphQLField:
         assert isinstance(field, Field), "Expected Field, got {}".format(repr(field))
+        self._check_async_field(field)
 
-        _arg_names = field.args.keys() if field.args else []
-
-        # NOTE: While we could just convert names back using
-        # to_snake_case(), doing so would mean assuming names in Python
-        # are in snake_case, which might not always be the case.
-
-        ARG_NAMES_PYTHON_TO_GQL = {
-            py_name: _name_to_graphql(py_name) for py_name in _arg_names
-        }
-
-        ARG_NAMES_GQL_TO_PYTHON = {
-            gql_name: py_name for py_name, gql_name in ARG_NAMES_PYTHON_TO_GQL.items()
-        }
-
-        @functools.wraps(field.resolver)
-        def _wrapped_resolver(root, info, **js_kwargs):
-            kwargs = {}
-            for js_name, py_name in ARG_NAMES_GQL_TO_PYTHON.items():
-
-                # If an argument was omitted in the query (as opposed to
-                # setting its value to NULL), it will be missing from the
-                # keyword arguments passed to the resolver.
+        resolver = self.make_resolver(field)
 
-                # We want to make sure we preserve that behaviour when
-                # converting names from camelCase to snake_case.
-
-                try:
-                    kwargs[py_name] = js_kwargs[js_name]
-                except KeyError:
-                    pass
-
-            return field.resolver(root, info, **kwargs)
+        # Arguments are renamed back to their Python names by
+        # graphql-core itself while coercing values (see out_name in
+        # _compile_field_argument()), so the resolver can be called
+        # directly, with no wrapper in between.
+        #
+        # Arguments omitted in the query (as opposed to set to NULL)
+        # are still missing from the keyword arguments passed to the
+        # resolver.
 
         compiled_type = GraphQLField(
             type_=self.get_graphql_type(field.type),
             args={},  # placeholder
-            resolve=_wrapped_resolver,
+            resolve=resolver,
             description=field.description,
             deprecation_reason=field.deprecation_reason,
+            extensions=_get_field_extensions(field),
         )
 
         self.add_to_cache(field, compiled_type)
 
-        compiled_type.args = (
-            {
-                ARG_NAMES_PYTHON_TO_GQL[name]: self.compile_argument(arg)
+        if not field.args:
+            compiled_type.args = {}
+        elif self.naming.is_identity:
+            # Names are the same on both sides: use compiled arguments
+            # as they are, with no renaming at all.
+            compiled_type.args = {
+                name: self.compile_argument(arg) for name, arg in field.args.items()
+            }
+        else:
+            # NOTE: While we could just convert names back using
+            # to_snake_case(), doing so would mean assuming names in
+            # Python are in snake_case, which might not always be the
+            # case.
+            to_graphql = self.naming.to_graphql
+            compiled_type.args = {
+                to_graphql(name): self._compile_field_argument(
+                    arg, out_name=name, name=to_graphql(name)
+                )
                 for name, arg in field.args.items()
             }
-            if field.args
-            else {}
-        )
 
         return compiled_type
 
+    def make_resolver(self, field):
+        """Get the function resolving a field in the compiled schema"""
+
+        resolver = field.resolver
+        if field.is_batched:
+            resolver = make_batch_resolver(field)
+
+        # Decided here, rather than on every call, so that schemas
+        # compiled without tracing don't pay for it at all.
+        if self.tracing:
+            resolver = make_traced_resolver(resolver)
+
+        return resolver
+
+    def _compile_field_argument(self, arg, out_name, name):
+        compiled = self.compile_argument(arg)
+        if out_name == name:
+            return compiled
+        kwargs = compiled.to_kwargs()
+        kwargs["out_name"] = out_name
+        return GraphQLArgument(**kwargs)
+
     @cache_compiled_object
     def compile_argument(self, arg: Argument) -> GraphQLArgument:
         assert isinstance(arg, Argument)
@@ -258,48 +482,65 @@ class GraphQLCompiler:
     def compile_input_object(self, obj: InputObject) -> GraphQLInputObjectType:
         assert isinstance(obj, InputObject)
 
-        # Create map between fields used internally and by the client.
-        # Convert all names to camelCase, as that's the convention
-        # normally used with GraphQL / Javascript.
-
+        # Convert names according to the naming strategy (camelCase
+        # by default, as that's the convention normally used with
+        # GraphQL / Javascript).
         # NOTE: see note about name conversion in compile_field()
-
-        FIELD_NAMES_PYTHON_TO_GQL = {
-            py_name: _name_to_graphql(py_name) for py_name in obj.fields.keys()
-        }
-
-        FIELD_NAMES_GQL_TO_PYTHON = {
-            gql_name: py_name for py_name, gql_name in FIELD_NAMES_PYTHON_TO_GQL.items()
-        }
-
-        # Create an instance of the object that will be passed as argument
-        # to the resolver.
-        # We need to convert names to their original form (usually
-        # snake_case).
-        def create_container(arg):
-            return obj.container_type(
-                **{
-                    FIELD_NAMES_GQL_TO_PYTHON[name]: value
-                    for name, value in arg.items()
+        def compile_fields():
+            self.compiled_types += 1
+            if self.naming.is_identity:
+                # Only fields with an explicit out_name get renamed
+                return {
+                    name: self.compile_input_field(field)
+                    for name, field in obj.fields.items()
                 }
-            )
+            to_graphql = self.naming.to_graphql
+            return {
+                to_graphql(name): self._compile_input_object_field(
+                    field, out_name=field.out_name or name
+                )
+                for name, field in obj.fields.items()
+            }
 
         compiled_type = GraphQLInputObjectType(
             name=obj.name,
-            fields={},  # placeholder
+            fields=compile_fields if self.lazy else {},  # placeholder
             description=obj.description,
-            out_type=create_container,
+            out_type=self._make_input_container_factory(obj),
         )
 
         self.add_to_cache(obj, compiled_type)
 
-        compiled_type.fields = {
-            FIELD_NAMES_PYTHON_TO_GQL[name]: self.compile_input_field(field)
-            for name, field in obj.fields.items()
-        }
+        if not self.lazy:
+            self.definitions.append((obj, obj._version))
+
+            def complete():
+                compiled_type.fields = compile_fields()
+
+            self._complete_type(complete)
 
         return compiled_type
 
+    def _make_input_container_factory(self, obj):
+        # Create an instance of the object that will be passed as argument
+        # to the resolver.
+        # graphql-core already coerces values to a new dict, keyed by
+        # the fields' out_name, which we set to the original name
+        # (usually snake_case). The container can just take over
+        # that dict, with no further renaming or copying.
+        def create_container(values):
+            return obj.container_type._from_dict(values)
+
+        return create_container
+
+    def _compile_input_object_field(self, field, out_name):
+        compiled = self.compile_input_field(field)
+        if compiled.out_name == out_name:
+            return compiled
+        kwargs = compiled.to_kwargs()
+        kwargs["out_name"] = out_name
+        return GraphQLInputField(**kwargs)
+
     @cache_compiled_object
     def compile_input_field(self, field: InputField) -> GraphQLInputField:
         assert isinstance(field, InputField)
@@ -313,13 +554,32 @@ class GraphQLCompiler:
     @cache_compiled_object
     def compile_union(self, union: Union) -> GraphQLUnionType:
         assert isinstance(union, Union)
+
+        def compile_types():
+            return tuple(self.get_graphql_type(t) for t in union.types)
+
         return GraphQLUnionType(
             name=union.name,
-            types=tuple(self.get_graphql_type(t) for t in union.types),
-            resolve_type=union.resolve_type,
+            types=compile_types if self.lazy else compile_types(),
+            resolve_type=self._make_resolve_type(union),
             description=union.description,
         )
 
+    def wrap_type(self, wrapper_type, of_type):
+        """Get a wrapping type (eg. ``GraphQLNonNull(of_type)``)
+
+        Instances are shared, so that identical types compiled from
+        different fields (such as ``NonNull(str)``, for each required
+        argument) don't take up memory over and over again.
+        """
+
+        key = (wrapper_type, of_type)
+        try:
+            return self._wrappers[key]
+        except KeyError:
+            wrapped = self._wrappers[key] = wrapper_type(of_type)
+            return wrapped
+
     def get_graphql_type(self, pytype):
         """Resolve a Python type to equivalent GraphQL type"""
 
@@ -336,10 +596,10 @@ class GraphQLCompiler:
             return self.compile_union(pytype)
 
         if isinstance(pytype, NonNull):
-            return GraphQLNonNull(self.get_graphql_type(pytype.subtype))
+            return self.wrap_type(GraphQLNonNull, self.get_graphql_type(pytype.subtype))
 
         if isinstance(pytype, List):
-            return GraphQLList(self.get_graphql_type(pytype.subtype))
+            return self.wrap_type(GraphQLList, self.get_graphql_type(pytype.subtype))
 
         # If it's a GraphQL type already, just let it through
         # TODO: is this a good thing? W/O a good usecase, remove this
@@ -370,7 +630,7 @@ class GraphQLCompiler:
         pytype_origin = getattr(pytype, "__origin__", None)
         if pytype_origin is list or pytype_origin is typing.List:
             (arg,) = pytype.__args__
-            return GraphQLList(self.get_graphql_type(arg))
+            return self.wrap_type(GraphQLList, self.get_graphql_type(arg))
 
         # TODO: support typing.Union type too!
 
@@ -381,6 +641,8 @@ class GraphQLCompiler:
         raise TypeError("Unable to map Python type to GraphQL: %s", repr(pytype))
 
 
-def _name_to_graphql(name):
-    """Convert Python snake_case names to GraphQL camelCase"""
-    return to_camel_case(name)
+def _get_field_extensions(field):
+    # Used by pyql.schema.cost to look up field costs
+    if field.cost is None:
+        return None
+    return {"cost": field.cost}
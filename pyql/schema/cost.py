@@ -0,0 +1,368 @@
+"""Query cost analysis
+
+Estimates how expensive a query is going to be, before running it, so
+that overly complex queries (eg. deeply nested lists) can be rejected
+upfront.
+
+The cost of a field is its own cost (set via the ``cost`` argument to
+``Object.define_field()``, defaulting to 1 for fields returning
+objects and 0 for scalars), plus the cost of its sub-fields. For list
+fields, the cost of sub-fields is multiplied by the number of items
+requested via a ``first``, ``last`` or ``limit`` argument, if any.
+
+Fragments are counted as if they all applied, so the cost of queries
+on unions and interfaces is an upper bound. Introspection fields
+(``__schema`` and ``__type``) are counted like any other field; their
+lists have no size arguments, so nesting them is limited by depth.
+
+Each selection set (eg. a fragment) is analyzed once per type, however
+many times it's reached, and the analysis stops as soon as a limit is
+exceeded, so that checking a query never takes much longer than
+validating it.
+
+The analysis of each operation is cached, along with the parsed
+document. Only the multipliers set via variables need to be looked up
+again on each execution.
+"""
+
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLList,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationType,
+    SchemaMetaFieldDef,
+    TypeMetaFieldDef,
+    VariableNode,
+    get_named_type,
+    get_nullable_type,
+    is_composite_type,
+    value_from_ast_untyped,
+)
+
+# Arguments setting the number of items returned by list fields
+LIST_SIZE_ARGUMENTS = ("first", "last", "limit")
+
+# Introspection fields of the query type (``__typename`` is a scalar,
+# and costs nothing)
+INTROSPECTION_FIELDS = {
+    "__schema": SchemaMetaFieldDef,
+    "__type": TypeMetaFieldDef,
+}
+
+
+class OperationCost:
+    """Result of the cost analysis of an operation
+
+    Attributes:
+        depth:
+            maximum depth of nested fields; if the analysis stopped
+            at the ``max_depth`` it was given, the first depth found
+            over it.
+        variables: names of variables used as list multipliers
+    """
+
+    __slots__ = ("depth", "variables", "_nodes", "_cost")
+
+    def __init__(self, nodes, depth, variables):
+        self._nodes = nodes
+        self.depth = depth
+        self.variables = variables
+        self._cost = None
+
+    def get_cost(self, variable_values=None):
+        """Get the total cost, for the given variable values"""
+
+        if self._cost is not None:
+            return self._cost
+        cost = _sum_costs(self._nodes, variable_values or {}, None, {})
+        if not self.variables:
+            self._cost = cost
+        return cost
+
+    def exceeds(self, max_cost, variable_values=None):
+        """Check whether the total cost is over ``max_cost``
+
+        Stops adding up costs as soon as the limit is exceeded.
+        """
+
+        if self._cost is not None:
+            return self._cost > max_cost
+        try:
+            cost = _sum_costs(self._nodes, variable_values or {}, max_cost, {})
+        except _LimitExceeded:
+            return True
+        if not self.variables:
+            self._cost = cost
+        return False
+
+
+class _LimitExceeded(Exception):
+    pass
+
+
+class _CostNode:
+    __slots__ = ("cost", "multiplier", "children")
+
+    def __init__(self, cost, multiplier, children):
+        self.cost = cost
+        # Either an int, or a (variable name, default) tuple
+        self.multiplier = multiplier
+        self.children = children
+
+
+def _sum_costs(nodes, variable_values, limit, memo):
+    # Lists of children are shared by all the occurrences of the same
+    # selection set (eg. a fragment spread in many places), so their
+    # totals are only computed once. Costs and multipliers are never
+    # negative, so any partial total over the limit means the whole
+    # operation is.
+    total = 0
+    for node in nodes:
+        multiplier = node.multiplier
+        if not isinstance(multiplier, int):
+            name, default = multiplier
+            multiplier = _get_list_size(variable_values.get(name, default))
+        total += node.cost
+        children = node.children
+        if children and multiplier:
+            try:
+                subtotal = memo[id(children)]
+            except KeyError:
+                subtotal = memo[id(children)] = _sum_costs(
+                    children, variable_values, limit, memo
+                )
+            total += multiplier * subtotal
+        if limit is not None and total > limit:
+            raise _LimitExceeded()
+    return total
+
+
+def _get_list_size(value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return max(value, 0)
+    return 1
+
+
+def analyze_operation(compiled, document, operation_name=None, max_depth=None):
+    """Analyze the cost of an operation in a validated document
+
+    If ``max_depth`` is set, the analysis stops as soon as a field
+    deeper than that is found.
+
+    Returns:
+        OperationCost, or None if the operation could not be found
+        (execution will report the error).
+    """
+
+    operation = _get_operation(document, operation_name)
+    if operation is None:
+        return None
+
+    root_type = {
+        OperationType.QUERY: compiled.query_type,
+        OperationType.MUTATION: compiled.mutation_type,
+        OperationType.SUBSCRIPTION: compiled.subscription_type,
+    }[operation.operation]
+
+    if root_type is None:
+        return None
+
+    analyzer = _CostAnalyzer(compiled, document, operation, max_depth)
+    try:
+        nodes, depth = analyzer.analyze_selection_set(
+            root_type, operation.selection_set
+        )
+    except _LimitExceeded:
+        return OperationCost(None, analyzer.depth, frozenset())
+    return OperationCost(nodes, depth, frozenset(analyzer.variables))
+
+
+def _get_operation(document, operation_name):
+    operations = [
+        definition
+        for definition in document.definitions
+        if definition.kind == "operation_definition"
+    ]
+    if operation_name is None:
+        return operations[0] if len(operations) == 1 else None
+    for operation in operations:
+        if operation.name and operation.name.value == operation_name:
+            return operation
+    return None
+
+
+class _CostAnalyzer:
+
+    # Selection sets are analyzed once per parent type, no matter how
+    # many times they're reached (eg. fragments spread in several
+    # places), and the resulting nodes are shared: the analysis takes
+    # time proportional to the size of the document, rather than to
+    # the size of the fully expanded query.
+
+    def __init__(self, schema, document, operation, max_depth=None):
+        self.schema = schema
+        self.fragments = {
+            definition.name.value: definition
+            for definition in document.definitions
+            if definition.kind == "fragment_definition"
+        }
+        self.variable_defaults = {
+            definition.variable.name.value: (
+                value_from_ast_untyped(definition.default_value)
+                if definition.default_value
+                else None
+            )
+            for definition in operation.variable_definitions or ()
+        }
+        self.variables = set()
+        self.max_depth = max_depth
+        # Deepest field found so far
+        self.depth = 0
+        # (parent type name, id(selection set)) -> (nodes, depth)
+        self._selection_sets = {}
+        self._in_progress = set()
+
+    def check_depth(self, depth):
+        if depth > self.depth:
+            self.depth = depth
+            if self.max_depth is not None and depth > self.max_depth:
+                raise _LimitExceeded()
+
+    def analyze_selection_set(self, parent_type, selection_set, depth=1):
+        """Analyze the fields selected on a type
+
+        Returns:
+            a ``(nodes, depth)`` tuple; ``depth`` is the number of
+            levels of nested fields, starting from this one.
+        """
+
+        key = (parent_type.name, id(selection_set))
+        try:
+            nodes, relative_depth = self._selection_sets[key]
+        except KeyError:
+            if key in self._in_progress:
+                # Fragment cycle: should have been caught by validation
+                return [], 0
+            self._in_progress.add(key)
+            nodes, relative_depth = self._analyze_selections(
+                parent_type, selection_set, depth
+            )
+            self._in_progress.discard(key)
+            self._selection_sets[key] = nodes, relative_depth
+
+        self.check_depth(depth - 1 + relative_depth)
+        return nodes, relative_depth
+
+    def _analyze_selections(self, parent_type, selection_set, depth):
+        nodes = []
+        relative_depth = 0
+
+        for selection in selection_set.selections:
+
+            if isinstance(selection, FieldNode):
+                node, field_depth = self.analyze_field(parent_type, selection, depth)
+                if node is not None:
+                    nodes.append(node)
+                    relative_depth = max(relative_depth, field_depth)
+                continue
+
+            if isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments.get(selection.name.value)
+                if fragment is None:
+                    continue
+            else:
+                assert isinstance(selection, InlineFragmentNode)
+                fragment = selection
+
+            fragment_type = parent_type
+            if fragment.type_condition is not None:
+                fragment_type = self.schema.get_type(fragment.type_condition.name.value)
+
+            fragment_nodes, fragment_depth = self.analyze_selection_set(
+                fragment_type, fragment.selection_set, depth
+            )
+            nodes.extend(fragment_nodes)
+            relative_depth = max(relative_depth, fragment_depth)
+
+        return nodes, relative_depth
+
+    def analyze_field(self, parent_type, node, depth):
+        name = node.name.value
+        if name.startswith("__"):
+            field = INTROSPECTION_FIELDS.get(name)
+        else:
+            field = parent_type.fields.get(name)
+        if field is None:  # Should have been caught by validation
+            return None, 0
+
+        self.check_depth(depth)
+
+        field_type = get_named_type(field.type)
+        cost = (field.extensions or {}).get("cost")
+        if cost is None:
+            cost = 1 if is_composite_type(field_type) else 0
+
+        multiplier = 1
+        if isinstance(get_nullable_type(field.type), GraphQLList):
+            multiplier = self.get_list_size(field, node)
+
+        children = None
+        children_depth = 0
+        if node.selection_set is not None:
+            children, children_depth = self.analyze_selection_set(
+                field_type, node.selection_set, depth + 1
+            )
+
+        return _CostNode(cost, multiplier, children), 1 + children_depth
+
+    def get_list_size(self, field, node):
+        arguments = {argument.name.value: argument.value for argument in node.arguments}
+
+        for name in LIST_SIZE_ARGUMENTS:
+            value = arguments.get(name)
+
+            if isinstance(value, IntValueNode):
+                return _get_list_size(int(value.value))
+
+            if isinstance(value, VariableNode):
+                variable = value.name.value
+                self.variables.add(variable)
+                return variable, self.variable_defaults.get(variable)
+
+            if value is None and name in field.args:
+                default = field.args[name].default_value
+                if isinstance(default, int):
+                    return _get_list_size(default)
+
+        return 1
+
+
+def check_operation_cost(cost, variable_values, max_cost=None, max_depth=None):
+    """Check the cost of an operation against the limits
+
+    Returns:
+        a list of errors, or None if the operation is within limits.
+    """
+
+    if max_depth is not None and cost.depth > max_depth:
+        # The cost of operations over the maximum depth is not known,
+        # as their analysis was cut short.
+        return [
+            GraphQLError(
+                "Query is too deep: maximum allowed depth is {}".format(max_depth),
+                extensions={"code": "QUERY_TOO_DEEP", "maxDepth": max_depth},
+            )
+        ]
+
+    if max_cost is not None and cost.exceeds(max_cost, variable_values):
+        return [
+            GraphQLError(
+                "Query is too complex: maximum allowed cost is {}".format(max_cost),
+                extensions={"code": "QUERY_TOO_COMPLEX", "maxCost": max_cost},
+            )
+        ]
+
+    return None
@@ -0,0 +1,298 @@
+"""Execution of GraphQL operations against a compiled schema
+
+This mirrors what ``graphql.graphql()`` does (validate schema, parse,
+validate document, execute), except parsed and validated documents
+are kept in a cache, so that repeated queries go straight to
+execution.
+"""
+
+import json
+from inspect import isawaitable, iscoroutine
+
+from graphql import ExecutionContext as BaseExecutionContext
+from graphql import (
+    ExecutionResult,
+    GraphQLError,
+    GraphQLNonNull,
+    execute,
+    parse,
+    validate,
+    validate_schema,
+)
+
+from pyql.schema.batching import LoaderRegistry
+from pyql.schema.cost import analyze_operation, check_operation_cost
+from pyql.schema.introspection import is_introspection_operation, make_result_key
+from pyql.schema.tracing import Tracer, execute_traced, should_trace
+
+
+class ExecutionContext(BaseExecutionContext):
+    """Execution context, completing lists of leaf values in bulk
+
+    Leaf types with a ``serialize_list()`` method (eg. enums, or the
+    scalars in ``pyql.schema.types.extra``) get a chance to serialize a
+    whole list at once, instead of having each item go through
+    ``complete_value()``.
+    """
+
+    def complete_list_value(self, return_type, field_nodes, info, path, result):
+        item_type = return_type.of_type
+        if isinstance(item_type, GraphQLNonNull):
+            item_type = item_type.of_type
+
+        serialize_list = getattr(item_type, "serialize_list", None)
+        if serialize_list is not None and isinstance(result, (list, tuple)):
+            # Returns None if any item needs the general path (eg. null
+            # values, or awaitables)
+            serialized = serialize_list(result)
+            if serialized is not None:
+                return serialized
+
+        return super().complete_list_value(return_type, field_nodes, info, path, result)
+
+
+class CachedDocument:
+    """A parsed query document, along with its validation outcome
+
+    The cost analysis of its operations is cached here too, by
+    operation name and maximum depth, the first time it's needed; so
+    are the results of introspection operations (see
+    ``pyql.schema.introspection``).
+    """
+
+    __slots__ = ("document", "errors", "costs", "introspection", "results")
+
+    def __init__(self, document, errors):
+        self.document = document
+        self.errors = errors
+        self.costs = {}
+        # Whether operations (by name) are introspection-only
+        self.introspection = {}
+        # Data of introspection results, serialized as JSON, by
+        # make_result_key()
+        self.results = {}
+
+    def is_introspection(self, operation_name=None):
+        """Check whether an operation only selects introspection fields"""
+
+        try:
+            return self.introspection[operation_name]
+        except KeyError:
+            pass
+
+        result = is_introspection_operation(self.document, operation_name)
+        self.introspection[operation_name] = result
+        return result
+
+    def get_cost(self, compiled, operation_name=None, max_depth=None):
+        """Get the cost analysis of an operation
+
+        Returns:
+            OperationCost, or None if the operation was not found.
+        """
+
+        key = (operation_name, max_depth)
+        try:
+            return self.costs[key]
+        except KeyError:
+            pass
+
+        cost = analyze_operation(compiled, self.document, operation_name, max_depth)
+        self.costs[key] = cost
+        return cost
+
+
+def parse_and_validate(compiled, source):
+    """Parse and validate a query against a compiled schema
+
+    Returns:
+        CachedDocument: ``document`` is None if the query could not
+        be parsed; ``errors`` is None if the document is valid.
+    """
+
+    try:
+        document = parse(source)
+    except GraphQLError as error:
+        return CachedDocument(None, [error])
+
+    errors = validate(compiled, document)
+    return CachedDocument(document, errors or None)
+
+
+def get_document(cache, compiled, source):
+    """Get a parsed and validated document, using the cache if possible"""
+
+    if not isinstance(source, str):
+        # Source objects are not hashable; nothing to cache here.
+        return parse_and_validate(compiled, source)
+
+    key = (id(compiled), source)
+    cached = cache.get(key)
+    if cached is None:
+        cached = parse_and_validate(compiled, source)
+        cache.set(key, cached)
+    return cached
+
+
+def execute_document(
+    compiled,
+    cache,
+    source,
+    root_value=None,
+    context_value=None,
+    variable_values=None,
+    operation_name=None,
+    field_resolver=None,
+    type_resolver=None,
+    middleware=None,
+    execution_context_class=None,
+    max_cost=None,
+    max_depth=None,
+    tracing_sample_rate=None,
+):
+    """Execute a GraphQL operation on a compiled schema
+
+    Accepts the same arguments as ``graphql.graphql()``, except for
+    ``cache``, which is used to store parsed documents, and
+    ``max_cost`` / ``max_depth``, limiting the cost and depth of
+    operations; operations going over the limits are rejected before
+    execution (see ``pyql.schema.cost``).
+
+    ``execution_context_class`` defaults to ``ExecutionContext``, from
+    this module.
+
+    If ``tracing_sample_rate`` is set, that fraction of the executions
+    is traced (the schema must have been compiled with tracing, see
+    ``pyql.schema.tracing``).
+
+    Results of introspection-only operations are cached with the
+    document, unless ``middleware`` is given; they're not traced.
+
+    Returns:
+        the ``ExecutionResult``, or an awaitable if any of the
+        resolvers returned an awaitable.
+    """
+
+    schema_errors = validate_schema(compiled)
+    if schema_errors:
+        return ExecutionResult(data=None, errors=schema_errors)
+
+    cached = get_document(cache, compiled, source)
+    if cached.errors:
+        return ExecutionResult(data=None, errors=cached.errors)
+
+    if max_cost is not None or max_depth is not None:
+        cost = cached.get_cost(compiled, operation_name, max_depth)
+        if cost is not None:
+            errors = check_operation_cost(cost, variable_values, max_cost, max_depth)
+            if errors:
+                return ExecutionResult(data=None, errors=errors)
+
+    if execution_context_class is None:
+        execution_context_class = ExecutionContext
+
+    if middleware is None and cached.is_introspection(operation_name):
+        key = make_result_key(operation_name, variable_values)
+        if key is not None:
+            return _get_introspection_result(
+                cached,
+                key,
+                compiled,
+                variable_values,
+                operation_name,
+                execution_context_class,
+            )
+
+    if tracing_sample_rate is not None and should_trace(tracing_sample_rate):
+        return execute_traced(
+            Tracer(),
+            execute,
+            compiled,
+            cached.document,
+            root_value,
+            context_value,
+            variable_values,
+            operation_name,
+            field_resolver,
+            type_resolver,
+            middleware,
+            execution_context_class,
+        )
+
+    return execute(
+        compiled,
+        cached.document,
+        root_value,
+        context_value,
+        variable_values,
+        operation_name,
+        field_resolver,
+        type_resolver,
+        middleware,
+        execution_context_class,
+    )
+
+
+def _get_introspection_result(
+    cached, key, compiled, variable_values, operation_name, execution_context_class
+):
+    serialized = cached.results.get(key)
+
+    if serialized is None:
+        # Introspection resolvers are all synchronous, and don't look
+        # at the root or context values.
+        result = execute(
+            compiled,
+            cached.document,
+            variable_values=variable_values,
+            operation_name=operation_name,
+            execution_context_class=execution_context_class,
+        )
+        if not result.errors:
+            cached.results[key] = json.dumps(result.data, separators=(",", ":"))
+        return result
+
+    # Each result gets its own copy of the data, so callers are free
+    # to modify it. Loading JSON is several times faster than a deep
+    # copy (and still much faster than executing the query again).
+    return ExecutionResult(data=json.loads(serialized), errors=None)
+
+
+async def execute_document_async(compiled, cache, *args, **kwargs):
+    """Execute a GraphQL operation asynchronously
+
+    Accepts the same arguments as ``execute_document()``. A new loader
+    registry is activated for the duration of the execution, so that
+    batch resolvers can coalesce loads.
+    """
+
+    with LoaderRegistry():
+        result = execute_document(compiled, cache, *args, **kwargs)
+        if isawaitable(result):
+            return await result
+        return result
+
+
+def execute_document_sync(compiled, cache, *args, **kwargs):
+    """Execute a GraphQL operation synchronously, without asyncio
+
+    Accepts the same arguments as ``execute_document()``.
+
+    Raises:
+        RuntimeError: if any resolver returned an awaitable.
+    """
+
+    result = execute_document(compiled, cache, *args, **kwargs)
+
+    if isawaitable(result):
+        if iscoroutine(result):
+            # Avoid "coroutine was never awaited" warnings
+            result.close()
+        raise RuntimeError(
+            "GraphQL execution failed to complete synchronously: "
+            "a resolver returned an awaitable, but the schema has no "
+            "coroutine resolvers. Define asynchronous resolvers with "
+            "`async def`, or execute the query asynchronously."
+        )
+
+    return result
@@ -0,0 +1,72 @@
+"""Caching of introspection results
+
+Operations only selecting introspection fields (``__schema``,
+``__type``, ``__typename``) at the root, such as the standard
+introspection query sent by tools and gateways, always return the same
+result for a given compiled schema. Their results are cached with the
+parsed document (see ``pyql.schema.execution``), which is discarded
+whenever the schema is compiled again.
+"""
+
+from graphql import FieldNode, FragmentSpreadNode, OperationType
+from graphql.utilities import get_operation_ast
+
+
+def is_introspection_operation(document, operation_name=None):
+    """Check whether an operation only selects introspection fields
+
+    Subscriptions are never considered introspection operations.
+    """
+
+    operation = get_operation_ast(document, operation_name)
+    if operation is None or operation.operation == OperationType.SUBSCRIPTION:
+        return False
+
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if definition.kind == "fragment_definition"
+    }
+
+    return _only_introspection_fields(operation.selection_set, fragments, set())
+
+
+def _only_introspection_fields(selection_set, fragments, visited):
+    for selection in selection_set.selections:
+
+        if isinstance(selection, FieldNode):
+            if not selection.name.value.startswith("__"):
+                return False
+            continue
+
+        if isinstance(selection, FragmentSpreadNode):
+            name = selection.name.value
+            if name in visited:
+                continue
+            visited.add(name)
+            selection = fragments.get(name)
+            if selection is None:  # Should have been caught by validation
+                return False
+
+        if not _only_introspection_fields(selection.selection_set, fragments, visited):
+            return False
+
+    return True
+
+
+def make_result_key(operation_name, variable_values):
+    """Make a key for the result of an operation
+
+    Returns:
+        a hashable key, or None if variables can't be part of one.
+    """
+
+    if not variable_values:
+        return operation_name, ()
+
+    try:
+        key = operation_name, tuple(sorted(variable_values.items()))
+        hash(key)
+    except TypeError:  # eg. unhashable or unsortable values
+        return None
+    return key
@@ -0,0 +1,204 @@
+"""Lazy, reachability-driven schema compilation
+
+In lazy mode, the compiler creates GraphQL types as lightweight
+placeholders, whose fields (and interfaces, and union members) are
+compiled by graphql-core the first time they are accessed, by the
+validator or the executor.
+
+A regular ``GraphQLSchema`` walks the whole type graph on creation,
+and ``validate_schema()`` walks it again, defeating the point.
+``LazyGraphQLSchema`` instead starts from an index of type names,
+built by walking the pyql definitions (which is much cheaper than
+compiling them), and materializes types on demand. Schema validation
+is skipped: run your test suite against an eagerly compiled schema to
+catch errors in definitions.
+"""
+
+import typing
+
+from graphql import (
+    GraphQLSchema,
+    get_named_type,
+    is_interface_type,
+    is_object_type,
+)
+from graphql.type.schema import InterfaceImplementations
+
+from pyql.schema.types.core import InputObject, Interface, List, NonNull, Object, Union
+
+
+class LazyGraphQLSchema(GraphQLSchema):
+    """A GraphQLSchema materializing types only when needed"""
+
+    def __init__(self, compiler, schema):
+        # Only collects introspection types and directives
+        super().__init__(directives=schema.directives, assume_valid=True)
+
+        self._compiler = compiler
+        self._implementations_map = None
+
+        self.query_type = compiler._compile_object_or_none(schema.query)
+        self.mutation_type = compiler._compile_object_or_none(schema.mutation)
+        self.subscription_type = compiler._compile_object_or_none(schema.subscription)
+
+        self.type_map = LazyTypeMap(
+            self.type_map, compiler, index_types(compiler, schema)
+        )
+
+    def get_implementations(self, interface_type):
+        if self._implementations_map is None:
+            self._implementations_map = _build_implementations_map(
+                self.type_map.values()
+            )
+        return super().get_implementations(interface_type)
+
+
+class LazyTypeMap(dict):
+    """Type map, compiling types from their definitions on first access"""
+
+    def __init__(self, initial, compiler, index):
+        super().__init__(initial)
+        self._compiler = compiler
+        self._index = index
+        self._complete = False
+
+    def _load(self, name):
+        pytype = self._index.get(name)
+        if pytype is None:
+            return None
+        compiled = get_named_type(self._compiler.get_graphql_type(pytype))
+        super().__setitem__(name, compiled)
+        return compiled
+
+    def _load_all(self):
+        if self._complete:
+            return
+        for name in self._index:
+            if not super().__contains__(name):
+                self._load(name)
+        self._complete = True
+
+    def __missing__(self, name):
+        compiled = self._load(name)
+        if compiled is None:
+            raise KeyError(name)
+        return compiled
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __contains__(self, name):
+        return super().__contains__(name) or self._load(name) is not None
+
+    def __iter__(self):
+        self._load_all()
+        return super().__iter__()
+
+    def __len__(self):
+        self._load_all()
+        return super().__len__()
+
+    def keys(self):
+        self._load_all()
+        return super().keys()
+
+    def values(self):
+        self._load_all()
+        return super().values()
+
+    def items(self):
+        self._load_all()
+        return super().items()
+
+
+def _build_implementations_map(types):
+    implementations_map = {}
+
+    for named_type in types:
+        if not (is_interface_type(named_type) or is_object_type(named_type)):
+            continue
+        for iface in named_type.interfaces:
+            implementations = implementations_map.get(iface.name)
+            if implementations is None:
+                implementations = implementations_map[iface.name] = (
+                    InterfaceImplementations(objects=[], interfaces=[])
+                )
+            if is_interface_type(named_type):
+                implementations.interfaces.append(named_type)
+            else:
+                implementations.objects.append(named_type)
+
+    return implementations_map
+
+
+def index_types(compiler, schema):
+    """Map names of all types reachable from the schema to their definitions
+
+    Walks the pyql definitions without compiling them. While at it,
+    checks resolvers for coroutine functions, and records versions of
+    definitions, as the compiler would.
+    """
+
+    index = {}
+    seen = set()
+
+    # Root objects without fields are skipped, as in the eager compiler
+    stack = [
+        obj
+        for obj in (schema.query, schema.mutation, schema.subscription)
+        if obj is not None and obj.has_fields()
+    ]
+    stack.extend(schema.types or ())
+    stack.reverse()
+
+    while stack:
+        pytype = stack.pop()
+
+        if isinstance(pytype, (NonNull, List)):
+            stack.append(pytype.subtype)
+            continue
+
+        pytype_origin = getattr(pytype, "__origin__", None)
+        if pytype_origin is list or pytype_origin is typing.List:
+            stack.extend(pytype.__args__)
+            continue
+
+        if pytype in seen:
+            continue
+        seen.add(pytype)
+
+        if isinstance(pytype, (Object, Interface, InputObject)):
+            compiler.definitions.append((pytype, pytype._version))
+
+        if isinstance(pytype, (Object, Interface)):
+            for field in pytype.fields.values():
+                compiler._check_async_field(field)
+                stack.append(field.type)
+                if field.args:
+                    stack.extend(arg.type for arg in field.args.values())
+
+            if isinstance(pytype, Object):
+                compiler._check_async(pytype.is_type_of)
+                stack.extend(pytype.interfaces or ())
+            else:
+                compiler._check_async(pytype.resolve_type)
+
+        elif isinstance(pytype, InputObject):
+            stack.extend(field.type for field in pytype.fields.values())
+
+        elif isinstance(pytype, Union):
+            compiler._check_async(pytype.resolve_type)
+            stack.extend(pytype.types)
+
+        if isinstance(pytype, (Object, Interface, InputObject, Union)):
+            name = pytype.name
+        else:
+            # Scalars, enums, GraphQL types: cheap to compile
+            name = get_named_type(compiler.get_graphql_type(pytype)).name
+
+        index.setdefault(name, pytype)
+
+    return index
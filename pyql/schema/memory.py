@@ -0,0 +1,94 @@
+"""Memory accounting for schemas
+
+Estimates the memory taken by schema definitions, and by their
+compiled counterparts, by walking the graph of objects reachable from
+them and adding up their sizes.
+
+Code (modules, classes, functions) is not counted, as it's shared
+with the rest of the program; neither are the built-in types and
+directives provided by graphql-core, which are shared by all schemas.
+
+Sizes are estimates, based on ``sys.getsizeof()``. Note that, on
+Python 3.11+, attributes of objects without ``__slots__`` may be
+stored inline, and not be counted (the pyql definition classes all
+use ``__slots__``, but graphql-core types don't).
+"""
+
+import gc
+import sys
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+
+_SHARED_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+
+
+def get_deep_size(roots, exclude=()):
+    """Get the total size of objects reachable from ``roots``, in bytes
+
+    Args:
+        roots:
+            objects to start walking from
+        exclude:
+            objects not to be counted (nor walked into)
+    """
+
+    return sum(sys.getsizeof(obj) for obj in _walk(roots, exclude))
+
+
+def _walk(roots, exclude=()):
+    seen = {id(obj) for obj in exclude}
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        yield obj
+        stack.extend(gc.get_referents(obj))
+
+
+def _get_shared_graphql_objects():
+    from graphql import introspection_types, specified_directives
+    from graphql.type.scalars import specified_scalar_types
+
+    from pyql.schema.compile import DEFAULT_TYPE_MAP
+
+    return [
+        *introspection_types.values(),
+        *specified_scalar_types.values(),
+        *specified_directives,
+        *DEFAULT_TYPE_MAP.values(),
+    ]
+
+
+def get_schema_memory_info(schema):
+    """Estimate memory used by a schema
+
+    Returns:
+        dict: ``definition`` is the size of the pyql definitions, in
+        bytes; ``compiled`` is the size of the compiled schema (not
+        counting what is shared with the definitions), or None if the
+        schema hasn't been compiled yet.
+    """
+
+    definition_roots = [
+        schema.query,
+        schema.mutation,
+        schema.subscription,
+        schema.directives,
+        schema.types,
+    ]
+
+    info = {"definition": get_deep_size(definition_roots), "compiled": None}
+
+    if schema._compiled is not None:
+        # Objects referenced by the compiled schema, but belonging to
+        # the definitions (eg. container types) are not counted.
+        exclude = _get_shared_graphql_objects()
+        exclude.extend(_walk(definition_roots))
+        info["compiled"] = get_deep_size(
+            # The compiler is kept around too, along with its caches
+            [schema._compiled, schema._compiler],
+            exclude=exclude,
+        )
+
+    return info
@@ -0,0 +1,107 @@
+"""Naming strategies
+
+A naming strategy converts names of fields, arguments and input fields
+from Python to GraphQL, at compile time. By default, snake_case Python
+names are converted to camelCase, as is the convention in GraphQL.
+
+Schemas whose Python names already are the GraphQL ones can use the
+``identity`` strategy: the compiler then skips conversion altogether,
+and doesn't tell graphql-core to rename arguments and input fields
+back to their Python names while coercing values (see ``out_name`` in
+``pyql.schema.compile``).
+"""
+
+from pyql.utils.str_converters import to_camel_case
+
+
+class NamingStrategy:
+    """Convert names between Python and GraphQL
+
+    Converted names are kept in a pair of tables, so each name is only
+    converted once, and GraphQL names of compiled fields can be mapped
+    back to the Python ones.
+
+    Args:
+        name:
+            Identifies the strategy (eg. in ``repr()``)
+        convert:
+            Function converting a Python name to a GraphQL one, or
+            None to keep names as they are.
+    """
+
+    __slots__ = ("name", "convert", "to_graphql_names", "to_python_names")
+
+    def __init__(self, name, convert=None):
+        self.name = name
+        self.convert = convert
+        self.to_graphql_names = {}
+        self.to_python_names = {}
+
+    def __repr__(self):
+        return "<NamingStrategy {}>".format(self.name)
+
+    @property
+    def is_identity(self):
+        return self.convert is None
+
+    def to_graphql(self, name):
+        """Get the GraphQL name for a Python name"""
+
+        try:
+            return self.to_graphql_names[name]
+        except KeyError:
+            pass
+
+        graphql_name = name if self.convert is None else self.convert(name)
+        self.to_graphql_names[name] = graphql_name
+        # Different Python names might map to the same GraphQL one
+        # (eg. "foo_bar" and "fooBar"): keep the first one.
+        self.to_python_names.setdefault(graphql_name, name)
+        return graphql_name
+
+    def to_python(self, name):
+        """Get the Python name for a GraphQL name
+
+        Only names previously converted by ``to_graphql()`` are known;
+        others are returned unchanged.
+        """
+
+        return self.to_python_names.get(name, name)
+
+
+NAMING_STRATEGIES = {
+    "camel_case": to_camel_case,
+    "identity": None,
+}
+
+
+def get_naming_strategy(naming=None):
+    """Get a naming strategy
+
+    Args:
+        naming:
+            The name of a built-in strategy (``"camel_case"``, the
+            default, or ``"identity"``), a ``NamingStrategy`` instance,
+            or a function converting Python names to GraphQL.
+    """
+
+    if naming is None:
+        naming = "camel_case"
+
+    if isinstance(naming, NamingStrategy):
+        return naming
+
+    if isinstance(naming, str):
+        try:
+            return NamingStrategy(naming, NAMING_STRATEGIES[naming])
+        except KeyError:
+            raise ValueError("Unknown naming strategy: {!r}".format(naming)) from None
+
+    if callable(naming):
+        name = "{}.{}".format(
+            getattr(naming, "__module__", None),
+            getattr(naming, "__qualname__", repr(naming)),
+        )
+        return NamingStrategy(name, naming)
+
+    raise TypeError("Invalid naming strategy: {!r}".format(naming))
@@ -0,0 +1,173 @@
+"""Resolver tracing
+
+Records when each resolver was called, and how long it took, in the
+Apollo tracing format. Traces are added to ``ExecutionResult.extensions``,
+under the ``tracing`` key.
+
+Tracing has to be enabled when compiling the schema
+(``Schema(tracing=True)``), in which case resolvers are wrapped to
+record timings. Schemas compiled without tracing have no such
+wrappers, and pay nothing for it.
+
+Only requests selected by the sampling rate are traced; for the
+others, the wrappers only check that no tracer is active.
+"""
+
+import contextvars
+import datetime
+from inspect import isawaitable
+from time import perf_counter_ns
+
+_current_tracer = contextvars.ContextVar("pyql_tracer", default=None)
+
+TRACING_FORMAT_VERSION = 1
+
+
+class Tracer:
+    """Collect timings of the resolvers run during an execution
+
+    Can be used as a context manager, to activate the tracer while
+    executing a query. Activating it again (eg. to await the rest of
+    an asynchronous execution) doesn't reset the start time.
+    """
+
+    def __init__(self):
+        self.start_time = None
+        self.end_time = None
+        self._start = None
+        self._end = None
+        self._resolvers = []
+        self._tokens = []
+
+    def __enter__(self):
+        if self._start is None:
+            self.start_time = _utcnow()
+            self._start = perf_counter_ns()
+        self._tokens.append(_current_tracer.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        _current_tracer.reset(self._tokens.pop())
+        self.end_time = _utcnow()
+        self._end = perf_counter_ns()
+
+    def add_resolver(self, info, start, end):
+        """Record a resolver call (times from ``perf_counter_ns()``)"""
+
+        self._resolvers.append((info, start, end))
+
+    async def trace_awaitable(self, info, start, awaitable):
+        """Await a value returned by a resolver, recording the time
+        until it's available"""
+
+        try:
+            return await awaitable
+        finally:
+            self.add_resolver(info, start, perf_counter_ns())
+
+    def get_trace(self):
+        """Get the trace, in the Apollo tracing format"""
+
+        return {
+            "version": TRACING_FORMAT_VERSION,
+            "startTime": _format_time(self.start_time),
+            "endTime": _format_time(self.end_time),
+            "duration": self._end - self._start,
+            "execution": {
+                "resolvers": [
+                    {
+                        "path": info.path.as_list(),
+                        "parentType": info.parent_type.name,
+                        "fieldName": info.field_name,
+                        "returnType": str(info.return_type),
+                        "startOffset": start - self._start,
+                        "duration": end - start,
+                    }
+                    for info, start, end in self._resolvers
+                ]
+            },
+        }
+
+
+def _utcnow():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _format_time(value):
+    return value.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def get_tracer():
+    """Return the currently active tracer, if any"""
+
+    return _current_tracer.get()
+
+
+def make_traced_resolver(resolver):
+    """Wrap a resolver, to record its timings in the active tracer"""
+
+    def traced_resolver(root, info, **kwargs):
+        tracer = _current_tracer.get()
+        if tracer is None:
+            return resolver(root, info, **kwargs)
+
+        start = perf_counter_ns()
+        try:
+            result = resolver(root, info, **kwargs)
+        except Exception:
+            tracer.add_resolver(info, start, perf_counter_ns())
+            raise
+
+        if isawaitable(result):
+            return tracer.trace_awaitable(info, start, result)
+
+        tracer.add_resolver(info, start, perf_counter_ns())
+        return result
+
+    return traced_resolver
+
+
+def should_trace(sample_rate):
+    """Decide whether to trace a request, given the sampling rate"""
+
+    if sample_rate >= 1:
+        return True
+    if sample_rate <= 0:
+        return False
+
+    import random
+
+    return random.random() < sample_rate
+
+
+def add_trace(result, tracer):
+    """Add the trace to the extensions of an execution result"""
+
+    extensions = dict(result.extensions or {})
+    extensions["tracing"] = tracer.get_trace()
+    result.extensions = extensions
+    return result
+
+
+async def _finish_trace(tracer, awaitable):
+    with tracer:
+        result = await awaitable
+    return add_trace(result, tracer)
+
+
+def execute_traced(tracer, execute, *args, **kwargs):
+    """Run an execution function with the tracer active
+
+    Returns:
+        the ``ExecutionResult``, with the trace added, or an awaitable
+        resolving to it.
+    """
+
+    with tracer:
+        result = execute(*args, **kwargs)
+
+    if isawaitable(result):
+        # Keep the tracer active for the rest of the execution
+        return _finish_trace(tracer, result)
+
+    return add_trace(result, tracer)
@@ -1,14 +1,61 @@
-import asyncio
-import inspect
+import functools
+import keyword
 import warnings
+import weakref
 from collections.abc import Mapping
+from operator import attrgetter, methodcaller
 
-import graphql
+from pyql.schema.naming import get_naming_strategy
+from pyql.utils.cache import LRUCache
 
-from pyql.utils.cache import cached_property
+# Incremented every time any definition changes. Definitions keep
+# their own version too (see _changed()); schemas only need to check
+# the versions of the definitions they were compiled from when the
+# generation has changed since they last did.
+_generation = 0
+
+
+def _bump_generation():
+    global _generation
+    _generation += 1
+
+
+def _changed(definition):
+    """Record a change to an object, interface or input object"""
+    definition._version += 1
+    _bump_generation()
+
+
+class _CompileOption:
+    """Schema attribute affecting compilation
+
+    Setting it invalidates the compiled schema.
+    """
+
+    def __set_name__(self, owner, name):
+        self.attr = "_" + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance, self.attr)
+
+    def __set__(self, instance, value):
+        setattr(instance, self.attr, value)
+        instance._compiled = None
 
 
 class Schema:
+
+    query = _CompileOption()
+    mutation = _CompileOption()
+    subscription = _CompileOption()
+    directives = _CompileOption()
+    types = _CompileOption()
+    lazy = _CompileOption()
+    strict_types = _CompileOption()
+    tracing = _CompileOption()
+
     def __init__(
         self,
         *,
@@ -16,20 +63,135 @@ class Schema:
         mutation=None,
         subscription=None,
         directives=None,
-        types=None
+        types=None,
+        document_cache_size=128,
+        lazy=False,
+        strict_types=True,
+        max_cost=None,
+        max_depth=None,
+        tracing=False,
+        tracing_sample_rate=1.0,
+        scalars=None,
+        naming=None
     ):
 
+        self._compiled = None
         self.query = query or Object("Query")
         self.mutation = mutation or Object("Mutation")
         self.subscription = subscription or Object("Subscription")
         self.directives = directives
         self.types = types
+        self.lazy = lazy
+        self.strict_types = strict_types
+        self.max_cost = max_cost
+        self.max_depth = max_depth
+        self.tracing = tracing
+        self.tracing_sample_rate = tracing_sample_rate
+        self.scalars = dict(scalars) if scalars else {}
+        self.naming = naming
+
+        self._compiler = None
+        self._compiled_generation = None
+        # (definition, version) pairs for all the objects, interfaces
+        # and input objects the compiled schema was built from
+        self._compiled_versions = ()
+        self._compiled_hits = 0
+        self._compiled_recompiles = 0
+        self._document_cache = LRUCache(document_cache_size)
 
     def compile(self):
         from pyql.schema.compile import compile_schema
 
         return compile_schema(self)
 
+    @property
+    def compiled(self):
+        """Compiled GraphQL schema, reused across executions.
+
+        The schema is compiled again only if its definition changed
+        since the last compilation.
+        """
+
+        from pyql.schema.compile import GraphQLCompiler
+
+        generation = _generation
+        if self._compiled is None or (
+            self._compiled_generation != generation and not self._is_up_to_date()
+        ):
+            compiler = GraphQLCompiler.for_schema(self)
+            self._compiled = compiler.compile_schema(self)
+            self._compiler = compiler
+            # Root objects with no fields are not compiled, but adding
+            # fields to them changes the schema too
+            self._compiled_versions = compiler.definitions + [
+                (root, root._version)
+                for root in (self.query, self.mutation, self.subscription)
+            ]
+            self._compiled_recompiles += 1
+            self._document_cache.clear()
+        else:
+            self._compiled_hits += 1
+        self._compiled_generation = generation
+        return self._compiled
+
+    def _is_up_to_date(self):
+        # Definitions changed somewhere: check whether they're ours
+        for definition, version in self._compiled_versions:
+            if definition._version != version:
+                return False
+        return True
+
+    @property
+    def naming(self):
+        """Naming strategy (see ``pyql.schema.naming``)"""
+        return self._naming
+
+    @naming.setter
+    def naming(self, naming):
+        self._naming = get_naming_strategy(naming)
+        self._compiled = None
+
+    def cache_info(self):
+        """Return statistics about the schema caches"""
+
+        return {
+            "compiled": {
+                "hits": self._compiled_hits,
+                "recompiles": self._compiled_recompiles,
+            },
+            "documents": self._document_cache.info(),
+            # Number of types whose fields have been compiled so far;
+            # with lazy=True, only types reached by queries count.
+            "types": self._compiler.compiled_types if self._compiler else 0,
+        }
+
+    def memory_info(self):
+        """Estimate memory used by the schema definitions, and by the
+        compiled schema (see ``pyql.schema.memory``)"""
+
+        from pyql.schema.memory import get_schema_memory_info
+
+        return get_schema_memory_info(self)
+
+    def register_scalar(self, python_type, graphql_type):
+        """Map a Python type to a GraphQL scalar type
+
+        Overrides the built-in mapping, if any (eg. to serialize
+        ``decimal.Decimal`` values differently).
+
+        Args:
+            python_type:
+                The type (or marker object, like ``pyql.ID``) used in
+                annotations and field definitions
+            graphql_type:
+                The ``GraphQLScalarType`` (or any other leaf type) it
+                should be compiled to
+        """
+
+        self.scalars[python_type] = graphql_type
+        self._compiled = None
+        return graphql_type
+
     def set_query(self, query):
         self.query = query
 
@@ -42,51 +204,151 @@ class Schema:
     def execute(self, *args, sync=True, **kwargs):
         """Execute a GraphQL operation on this schema
 
+        Parsed and validated query documents are cached (see the
+        ``document_cache_size`` constructor argument), so repeated
+        queries skip straight to execution.
+
+        If none of the resolvers in the schema is a coroutine function,
+        synchronous execution doesn't involve asyncio at all, which
+        makes it safe to use from threads with no event loop.
+
         Args:
             sync:
                 If True (the default), run the query syncronously and
-                return the result. Return a coroutine otherwise.
+                return the result. Return a coroutine otherwise (same
+                as calling ``execute_async()``).
             variables:
                 (deprecated) variables to be passed to the query
             variable_values:
                 Variables to be passed to the query (replaces
                 "variables")
             *args:
-                Extra arguments passed to graphql.graphql()
+                Same arguments as graphql.graphql(), minus the schema
             **kwawrgs:
-                Extra arguments passed to graphql.graphql()
+                Same arguments as graphql.graphql(), minus the schema
         """
 
-        if "variables" in kwargs:
-            # TODO: issue a deprecation warning?
-            kwargs["variable_values"] = kwargs.pop("variables")
+        if not sync:
+            return self.execute_async(*args, **kwargs)
+
+        _rename_deprecated_kwargs(kwargs)
+        compiled = self.compiled
 
-        compiled = self.compile()
-        coro = graphql.graphql(compiled, *args, **kwargs)
+        if not self._compiler.has_async_resolvers:
+            from pyql.schema.execution import execute_document_sync
 
-        if sync:
+            return execute_document_sync(
+                compiled, self._document_cache, *args, **self._execution_kwargs(kwargs)
+            )
 
-            # In Python 3.7+ we could do:
-            # return asyncio.run(coro)
+        return _run_until_complete(self._execute_coroutine(compiled, *args, **kwargs))
 
-            loop = asyncio.get_event_loop()
-            return loop.run_until_complete(coro)
+    async def execute_async(self, *args, timeout=None, **kwargs):
+        """Execute a GraphQL operation on this schema, asynchronously
 
-        return coro
+        Uses the same compiled schema and document caches as
+        ``execute()``. Awaitables returned by resolvers are gathered
+        and run concurrently (except for mutation fields, which are
+        run serially as required by the spec).
+
+        Cancelling the task running this coroutine cancels all the
+        pending resolvers.
+
+        Args:
+            timeout:
+                Maximum time, in seconds, to wait for the result.
+                ``asyncio.TimeoutError`` is raised (and all pending
+                resolvers are cancelled) if it takes longer than that.
+            *args:
+                Same arguments as ``execute()``
+            **kwargs:
+                Same arguments as ``execute()``
+        """
+
+        _rename_deprecated_kwargs(kwargs)
+        coro = self._execute_coroutine(self.compiled, *args, **kwargs)
+
+        if timeout is not None:
+            import asyncio
+
+            return await asyncio.wait_for(coro, timeout)
+        return await coro
+
+    async def _execute_coroutine(self, compiled, *args, **kwargs):
+        from pyql.schema.execution import execute_document_async
+
+        return await execute_document_async(
+            compiled, self._document_cache, *args, **self._execution_kwargs(kwargs)
+        )
+
+    def _execution_kwargs(self, kwargs):
+        # Options set on the schema, unless overridden for a query
+        kwargs.setdefault("max_cost", self.max_cost)
+        kwargs.setdefault("max_depth", self.max_depth)
+        if self.tracing:
+            kwargs.setdefault("tracing_sample_rate", self.tracing_sample_rate)
+        return kwargs
+
+
+def _rename_deprecated_kwargs(kwargs):
+    if "variables" in kwargs:
+        # TODO: issue a deprecation warning?
+        kwargs["variable_values"] = kwargs.pop("variables")
+
+
+def _run_until_complete(coro):
+    # In Python 3.7+ we could do:
+    # return asyncio.run(coro)
+    # ...but that would create (and close) a new loop on every call.
+
+    # Imported here, as asyncio is quite expensive to import, and not
+    # needed at all to define (or synchronously execute) schemas.
+    import asyncio
+
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        # No event loop in this thread (eg. a worker thread)
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
 
 
 class Object:
+    __slots__ = (
+        "_frozen",
+        "_version",
+        "name",
+        "fields",
+        "interfaces",
+        "is_type_of",
+        "description",
+        "slots",
+        "registered_classes",
+        "_container_type",
+    )
+
     def __init__(
-        self, name, fields=None, interfaces=None, is_type_of=None, description=None
+        self,
+        name,
+        fields=None,
+        interfaces=None,
+        is_type_of=None,
+        description=None,
+        slots=False,
     ):
 
         self._frozen = False
+        self._version = 0
+        self._container_type = None
         self.name = name
         self.fields = {}
         self._load_field_args(fields)
         self.interfaces = interfaces
         self.is_type_of = is_type_of
         self.description = description
+        self.slots = slots
+        self.registered_classes = ()
 
     def _load_field_args(self, fields):
         if fields is None:
@@ -94,10 +356,60 @@ class Object:
         for name, type in fields.items():
             self.define_field(name, type)
 
-    def field(self, name):
+    def register_class(self, cls):
+        """Register a Python class, whose instances are of this type
+
+        When resolving a union or interface with no ``resolve_type``,
+        instances of the class (not of its subclasses) are resolved to
+        this object type with a single lookup, instead of trying
+        ``is_type_of`` of all the possible types in turn.
+
+        Can be used as a class decorator.
+        """
+
+        self.registered_classes += (cls,)
+        _changed(self)
+        return cls
+
+    def field(self, name, batch_key=None, cost=None):
+        """Decorator to define a field from its resolver
+
+        Args:
+            name:
+                name of the field
+            batch_key:
+                if set, the decorated function is a batch resolver.
+                See ``define_field()``.
+            cost:
+                cost of the field, for query cost analysis.
+                See ``define_field()``.
+        """
+
         def decorator(resolver):
             self._assert_not_frozen()
             field = field_from_resolver(resolver)
+            field.batch_key = batch_key
+            field.cost = cost
+            self._define_field(name, field)
+            return field
+
+        return decorator
+
+    def batch_field(self, name, cost=None):
+        """Decorator to define a field with a level-wide batch resolver
+
+        The decorated function will be called once for all the root
+        objects resolved during the same execution tick (usually, all
+        the objects at the same depth of the result tree) as
+        ``resolver(roots, info, **args)``, and must return a list
+        of values, one per root, in the same order.
+        """
+
+        def decorator(resolver):
+            self._assert_not_frozen()
+            field = field_from_resolver(resolver)
+            field.batch_roots = True
+            field.cost = cost
             self._define_field(name, field)
             return field
 
@@ -111,11 +423,34 @@ class Object:
         resolver=None,
         deprecation_reason=None,
         description=None,
+        batch_key=None,
+        cost=None,
     ):
+        """Define a new field on this object
+
+        Args:
+            batch_key:
+                Turn ``resolver`` into a batch resolver. Either the
+                name of an attribute (or key) of the root object, or a
+                function accepting the root object, returning the key
+                to be loaded.
+
+                Keys requested during the same execution tick are
+                collected, de-duplicated and passed as a list to
+                ``resolver(keys, info, **args)``, which must return a
+                list of values in the same order. Results are cached
+                for the duration of the request.
+            cost:
+                Cost of resolving the field, for query cost analysis
+                (see ``Schema(max_cost=...)``). Defaults to 1 for
+                fields returning objects, 0 for scalars and enums.
+        """
 
         self._assert_not_frozen()
 
         if resolver is None:
+            if batch_key is not None:
+                raise ValueError("A resolver is required when using batch_key")
             resolver = make_default_resolver(name)
 
         kwargs = {
@@ -124,6 +459,8 @@ class Object:
             "resolver": resolver,
             "deprecation_reason": deprecation_reason,
             "description": description,
+            "batch_key": batch_key,
+            "cost": cost,
         }
         field = Field(**kwargs)
         self._define_field(name, field)
@@ -138,12 +475,13 @@ class Object:
     def _define_field(self, name, field):
         self._assert_not_frozen()
         self.fields[name] = field
+        _changed(self)
 
     def has_fields(self):
         return len(self.fields) > 0
 
-    def __call__(self, **kwargs):
-        return self.container_type(**kwargs)
+    def __call__(self, *args, **kwargs):
+        return self.container_type(*args, **kwargs)
 
     def _freeze(self):
         # After the "container" object is created and cached,
@@ -154,9 +492,18 @@ class Object:
         if self._frozen:
             raise RuntimeError("Cannot make changes to a frozen schema object")
 
-    @cached_property
+    @property
     def container_type(self):
+        if self._container_type is None:
+            self._container_type = self._make_container_type()
+        return self._container_type
+
+    def _make_container_type(self):
         self._freeze()
+        if self.slots:
+            return make_container_type(
+                self.name, {k: None for k in self.fields}, slots=True
+            )
         # return make_container_type(self.name, {k: None for k in self.fields})
         return make_container_type(self.name, {})
 
@@ -179,55 +526,196 @@ class Object:
         return "<pyql.Object {}>".format(self.name)
 
 
-def make_container_type(type_name, fields):
+def make_container_type(type_name, fields, slots=False):
     """Make a "container type".
 
     Args:
         type_name:
             name for the new type
         fields:
-            name for the new fields
-        type_instance:
-            object instance the new type object instances will pretend
-            to be an instance of.
+            name for the new fields, mapped to their default value
+        slots:
+            if True, make a compact type, storing the fields in
+            ``__slots__`` instead of an instance dict. Instances only
+            accept the given fields, either as positional or keyword
+            arguments. Ignored if any field name would clash with the
+            members of the type itself (eg. ``_from_dict``, or names
+            starting with ``__``).
     """
 
+    if slots:
+        if not any(_is_reserved_name(name) for name in fields):
+            return _make_slots_container_type(type_name, fields)
+        # Defaults of reserved names would replace the type members
+        fields = {
+            key: val for key, val in fields.items() if not _is_reserved_name(key)
+        }
+
     return type(
         type_name, (ObjectContainer,), {key: val for key, val in fields.items()}
     )
 
 
+# Members of slots container types
+_RESERVED_NAMES = frozenset(["_from_dict"])
+
+
+def _is_reserved_name(name):
+    # Names starting with "__" would be mangled in __slots__
+    return name in _RESERVED_NAMES or name.startswith("__")
+
+
+def _make_slots_container_type(type_name, fields):
+    names = tuple(fields)
+    defaults = tuple(fields.values())
+
+    if all(name.isidentifier() and not keyword.iskeyword(name) for name in names):
+        # Generate specialized functions, setting each slot directly
+        # (much like namedtuple and dataclasses do). The instance is
+        # not called "self", so that it can be a field name.
+        __init__ = _compile_function(
+            "def __init__(__pyql_self__{}):".format(
+                "".join(", {}".format(name) for name in names)
+            ),
+            ["__pyql_self__.{0} = {0}".format(name) for name in names],
+        )
+        __init__.__defaults__ = defaults or None
+
+        _from_dict = _compile_function(
+            "def _from_dict(cls, values):",
+            ["self = new(cls)"]
+            + [
+                "self.{} = values.get({!r}, defaults[{}])".format(name, name, i)
+                for i, name in enumerate(names)
+            ]
+            + ["return self"],
+            {"new": object.__new__, "defaults": defaults},
+        )
+
+    else:
+        # Names that can't be used as arguments (eg. Python keywords)
+        def __init__(self, *args, **kwargs):
+            if len(args) > len(names):
+                raise TypeError(
+                    "{}() takes at most {} positional arguments".format(
+                        type_name, len(names)
+                    )
+                )
+            for name, value in zip(names, args):
+                setattr(self, name, value)
+            start = len(args)
+            for name, default in zip(names[start:], defaults[start:]):
+                setattr(self, name, kwargs.pop(name, default))
+            if kwargs:
+                raise TypeError(
+                    "{}() got unexpected keyword arguments: {}".format(
+                        type_name, ", ".join(kwargs)
+                    )
+                )
+
+        def _from_dict(cls, values):
+            return cls(**values)
+
+    __init__.__qualname__ = "{}.__init__".format(type_name)
+
+    return type(
+        type_name,
+        (ObjectContainer,),
+        {
+            "__slots__": names,
+            "__init__": __init__,
+            "_from_dict": classmethod(_from_dict),
+        },
+    )
+
+
+def _compile_function(signature, lines, globals=None):
+    source = "\n    ".join([signature] + (lines or ["pass"]))
+    namespace = {}
+    exec(source, dict(globals or {}), namespace)
+    (function,) = namespace.values()
+    return function
+
+
+@functools.lru_cache(maxsize=None)
 def make_default_resolver(name):
-    def default_resolver(root, info):
+    """Make a resolver, picking the named attribute (or key) from root
 
-        if root is None:
-            return None
+    Resolvers are shared between all fields with the same name. The
+    way to get the value is picked once per type of root object, so
+    each call only costs a dict lookup plus an attrgetter /
+    methodcaller call.
+    """
 
-        if isinstance(root, Mapping):
-            try:
-                return root[name]
-            except KeyError:
-                return None
+    # Keyed by id(root type), see _add_default_getter()
+    getters = {}
+    type_refs = {}
+
+    def default_resolver(root, info, **kwargs):
+        getter = getters.get(id(type(root)))
+        if getter is None:
+            getter = _add_default_getter(getters, type_refs, type(root), name)
 
         try:
-            return getattr(root, name)
+            return getter(root)
         except AttributeError:
-            pass
-
-        return None
+            return None
 
     return default_resolver
 
 
+def _add_default_getter(getters, type_refs, root_type, name):
+    # Types are only referenced weakly, and their getters dropped once
+    # they're gone, so that resolvers (shared by all schemas) don't
+    # keep alive container types of schemas no longer used. Entries
+    # are removed before the id of a type can be reused.
+    key = id(root_type)
+
+    def forget(ref):
+        getters.pop(key, None)
+        type_refs.pop(key, None)
+
+    type_refs[key] = weakref.ref(root_type, forget)
+    getter = getters[key] = _make_default_getter(root_type, name)
+    return getter
+
+
+def _make_default_getter(root_type, name):
+    if root_type is type(None):
+        return _return_none
+
+    if issubclass(root_type, Mapping):
+        return methodcaller("get", name)
+
+    return attrgetter(name)
+
+
+def _return_none(root):
+    return None
+
+
 class ObjectContainer:
     """Base class for "data-structure" objects from GraphQL objects"""
 
+    # Subclasses get an instance __dict__ unless they define __slots__
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         self.__dict__.update(kwargs)
 
+    @classmethod
+    def _from_dict(cls, values):
+        """Create a new instance, taking ownership of the values dict"""
+        self = object.__new__(cls)
+        self.__dict__ = values
+        return self
+
 
 class Interface:
+    __slots__ = ("_version", "name", "fields", "resolve_type", "description")
+
     def __init__(self, name, fields=None, resolve_type=None, description=None):
+        self._version = 0
         self.name = name
         self.fields = {}
         self._load_field_args(fields)
@@ -262,24 +750,65 @@ class Interface:
         }
         field = Field(**kwargs)
         self.fields[name] = field
+        _changed(self)
         return field
 
 
 class Field:
-    def __init__(self, type, args, resolver, description, deprecation_reason):
+    __slots__ = (
+        "type",
+        "args",
+        "resolver",
+        "description",
+        "deprecation_reason",
+        "batch_key",
+        "batch_roots",
+        "cost",
+    )
+
+    def __init__(
+        self,
+        type,
+        args,
+        resolver,
+        description,
+        deprecation_reason,
+        batch_key=None,
+        batch_roots=False,
+        cost=None,
+    ):
         self.type = type
         self.args = args
         self.resolver = resolver
         self.description = description
         self.deprecation_reason = deprecation_reason
+        self.batch_key = batch_key
+        self.batch_roots = batch_roots
+        self.cost = cost
+
+    @property
+    def is_batched(self):
+        return self.batch_roots or self.batch_key is not None
 
 
 class InputObject:
-    def __init__(self, name, fields=None, description=None):
+    __slots__ = (
+        "_version",
+        "name",
+        "fields",
+        "description",
+        "slots",
+        "_container_type",
+    )
+
+    def __init__(self, name, fields=None, description=None, slots=False):
+        self._version = 0
+        self._container_type = None
         self.name = name
         self.fields = {}
         self._load_field_args(fields)
         self.description = description
+        self.slots = slots
 
     def _load_field_args(self, fields):
         if fields is None:
@@ -298,10 +827,17 @@ class InputObject:
             out_name=out_name,
         )
         self.fields[name] = field
+        _changed(self)
 
-    @cached_property
+    @property
     def container_type(self):
-        return make_container_type(self.name, {k: None for k in self.fields})
+        if self._container_type is None:
+            self._container_type = make_container_type(
+                self.name,
+                {(f.out_name or k): None for k, f in self.fields.items()},
+                slots=self.slots,
+            )
+        return self._container_type
 
     def __instancecheck__(self, instance):
         # Allow instances of the container type to look like
@@ -310,6 +846,8 @@ class InputObject:
 
 
 class InputField:
+    __slots__ = ("type", "default_value", "description", "out_name")
+
     def __init__(self, type, default_value=None, description=None, out_name=None):
 
         self.type = type
@@ -319,6 +857,8 @@ class InputField:
 
 
 class Argument:
+    __slots__ = ("type", "default_value", "description")
+
     def __init__(self, type, default_value=None, description=None):
         self.type = type
         self.default_value = default_value
@@ -326,6 +866,7 @@ class Argument:
 
 
 def field_from_resolver(resolver):
+    import inspect  # Slow to import, only needed here
 
     signature = inspect.signature(resolver)
 
@@ -386,16 +927,22 @@ def field_from_resolver(resolver):
 
 
 class NonNull:
+    __slots__ = ("subtype",)
+
     def __init__(self, subtype):
         self.subtype = subtype
 
 
 class List:
+    __slots__ = ("subtype",)
+
     def __init__(self, subtype):
         self.subtype = subtype
 
 
 class Union:
+    __slots__ = ("name", "types", "resolve_type", "description")
+
     def __init__(self, name, types, resolve_type=None, description=None):
         self.name = name
         self.types = types
@@ -404,3 +951,7 @@ class Union:
 
 
 ID = object()
+
+# Markers for scalar types with no Python equivalent
+JSON = object()
+BigInt = object()
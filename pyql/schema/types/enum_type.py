@@ -1,4 +1,5 @@
 from enum import Enum
+from types import MappingProxyType
 
 from graphql import GraphQLEnumType as _GraphQLNamedType
 from graphql import GraphQLEnumValue
@@ -7,10 +8,12 @@ from graphql.language import ast
 
 class GraphQLEnumType(_GraphQLNamedType):
 
-    # Note: we're only subclassing _GraphQLNamedType so that
-    # is_type(...) / is_output_type(...) calls will still work.
-    # Maybe we can use __instancecheck__ instead? (Although having to
-    # use metaclasses is never great..)
+    # Note: we're subclassing _GraphQLNamedType so that is_type(...) /
+    # is_output_type(...) calls will still work, but values are looked
+    # up in the Python Enum, rather than in GraphQLEnumValues.
+    #
+    # Everything derived from the Enum (value tables, introspection
+    # data) is computed once, here: enums are immutable anyways.
 
     def __init__(self, *, enum):
         assert isinstance(enum, type) and issubclass(
@@ -18,29 +21,47 @@ class GraphQLEnumType(_GraphQLNamedType):
         ), "enum argument must be an Enum"
         self._enum = enum
 
-    @property
-    def name(self):
-        return self._enum.__name__
+        members = list(enum)  # Aliases excluded
 
-    @property
-    def description(self):
-        return self._enum.__doc__
+        # Maps enum value names, as used in GraphQL queries (see
+        # ``values``), to members
+        self.members_by_name = MappingProxyType(
+            {str(member.value): member for member in members}
+        )
 
-    @property
-    def values(self):
-        # Needed for introspection
-        # NOTE: the actual value used in queries is ``name``; keys are
-        # for internal use only.
-        return {
-            str(value.value): GraphQLEnumValue(value.value)
-            for key, value in self.get_values().items()
-        }
+        # Maps values to members, for values that can be looked up in
+        # a dict (others are left to the Enum itself)
+        by_value = {}
+        for member in members:
+            try:
+                by_value[member.value] = member
+            except TypeError:
+                pass
+        self.members_by_value = MappingProxyType(by_value)
+
+        super().__init__(
+            name=enum.__name__,
+            description=enum.__doc__,
+            # Needed for introspection
+            # NOTE: the actual value used in queries is ``name``; keys
+            # are for internal use only.
+            values={
+                name: GraphQLEnumValue(member.value)
+                for name, member in self.members_by_name.items()
+            },
+        )
+        self.values = MappingProxyType(self.values)
 
     def get_values(self):
         return self._enum.__members__
 
     def get_value(self, name):
-        return self._enum(name)
+        try:
+            return self.members_by_value[name]
+        except (KeyError, TypeError):
+            # Let the Enum raise an error, or look up the value in
+            # other ways (eg. via _missing_())
+            return self._enum(name)
 
     def serialize(self, value):
         """Serialize value to the client
@@ -52,9 +73,24 @@ class GraphQLEnumType(_GraphQLNamedType):
             str or int: value of the enum member
         """
 
-        if not isinstance(value, self._enum):
+        if type(value) is not self._enum and not isinstance(value, self._enum):
             raise TypeError("Value must be an instance of Enum: {}".format(self._enum))
-        return value.value
+        return value._value_
+
+    def serialize_list(self, values):
+        """Serialize a list of values at once
+
+        Returns:
+            the list of serialized values, or None if any of them is not
+            a member of the Enum (including None), in which case values
+            should be serialized one by one.
+        """
+
+        enum = self._enum
+        for value in values:
+            if type(value) is not enum:
+                return None
+        return [value._value_ for value in values]
 
     def parse_value(self, value):
         """Parse value from variable
@@ -65,7 +101,7 @@ class GraphQLEnumType(_GraphQLNamedType):
 
         return self.get_value(value)
 
-    def parse_literal(self, value_ast):
+    def parse_literal(self, value_ast, _variables=None):
         """Parse value from query
 
         Args:
@@ -73,7 +109,10 @@ class GraphQLEnumType(_GraphQLNamedType):
         """
 
         if isinstance(value_ast, ast.EnumValueNode):
-            return self.get_value(value_ast.value)
+            try:
+                return self.members_by_name[value_ast.value]
+            except KeyError:
+                return self.get_value(value_ast.value)
 
         if isinstance(value_ast, ast.IntValueNode):
             # We need this as there's no difference between an "enum
@@ -1,20 +1,78 @@
 """Non-standard GraphQL types
 
 The following types are not in the GraphQL spec, but are provided for
-convenience, to allow handling some common types (eg. timestamps).
+convenience, to allow handling some common types (eg. timestamps,
+UUIDs, decimals, binary data).
+
+Values in the most common ISO 8601 forms (eg. as returned by
+``isoformat()``) are parsed with ``fromisoformat()``; anything else is
+passed on to ``aniso8601``.
 """
 
+import base64
+import binascii
 import datetime
+import decimal
+import sys
+import uuid
 
-import aniso8601
-from graphql import GraphQLScalarType
+from graphql import GraphQLError, GraphQLScalarType
 from graphql.language import ast
+from graphql.pyutils import inspect
+from graphql.utilities import value_from_ast_untyped
+
+# Python < 3.11 can't validate base64 without a regex
+_HAS_STRICT_BASE64 = sys.version_info >= (3, 11)
+
+
+class BulkScalarType(GraphQLScalarType):
+    """Scalar type, able to serialize lists of values in bulk
+
+    Lists of values can be serialized all at once, with
+    ``serialize_list()``, which skips the per-item overhead of
+    ``serialize()`` when all the values are of the expected types.
+    """
+
+    def __init__(self, *, value_types, serialize, serialize_item=None, **kwargs):
+        super().__init__(serialize=serialize, **kwargs)
+        # Exact types of the values that can be serialized in bulk,
+        # with serialize_item() (defaults to serialize())
+        self.value_types = value_types
+        self.serialize_item = serialize_item or serialize
+
+    def serialize_list(self, values):
+        """Serialize a list of values
+
+        Returns:
+            the list of serialized values, or None if any of them is not
+            of the expected types (including None), or can't be
+            serialized (eg. ``Decimal("NaN")``), in which case values
+            should be serialized one by one, so that errors are
+            reported for each item.
+        """
+
+        value_types = self.value_types
+        for value in values:
+            if type(value) not in value_types:
+                return None
+        try:
+            return list(map(self.serialize_item, values))
+        except Exception:
+            return None
+
+
+def _fix_utc(value):
+    # fromisoformat() only accepts "Z" as a timezone on Python 3.11+
+    if value.endswith("Z"):
+        return value[:-1] + "+00:00"
+    return value
 
 
 def datetime_serialize(dt):
-    assert isinstance(
-        dt, (datetime.datetime, datetime.date)
-    ), 'Received not compatible datetime "{}"'.format(repr(dt))
+    if type(dt) not in (datetime.datetime, datetime.date):
+        assert isinstance(
+            dt, (datetime.datetime, datetime.date)
+        ), 'Received not compatible datetime "{}"'.format(repr(dt))
     return dt.isoformat()
 
 
@@ -24,17 +82,28 @@ def datetime_parse_literal(node):
 
 
 def datetime_parse_value(value):
+    # Only strings in the extended format, with a "T" separator, are
+    # accepted by aniso8601; fromisoformat() is more lenient.
+    if isinstance(value, str) and value[10:11] == "T":
+        try:
+            return datetime.datetime.fromisoformat(_fix_utc(value))
+        except ValueError:
+            pass
+
+    import aniso8601
+
     try:
         return aniso8601.parse_datetime(value)
     except ValueError:
         return None
 
 
-GraphQLDateTime = GraphQLScalarType(
+GraphQLDateTime = BulkScalarType(
     name="DateTime",
     description="The `DateTime` scalar type represents a DateTime"
     "value as specified by"
     "[iso8601](https://en.wikipedia.org/wiki/ISO_8601).",
+    value_types=(datetime.datetime, datetime.date),
     serialize=datetime_serialize,
     parse_literal=datetime_parse_literal,
     parse_value=datetime_parse_value,
@@ -42,6 +111,8 @@ GraphQLDateTime = GraphQLScalarType(
 
 
 def date_serialize(date):
+    if type(date) is datetime.date:
+        return date.isoformat()
     if isinstance(date, datetime.datetime):
         date = date.date()
     assert isinstance(date, datetime.date), 'Received not compatible date "{}"'.format(
@@ -56,17 +127,27 @@ def date_parse_literal(node):
 
 
 def date_parse_value(value):
+    # Fast path for the usual YYYY-MM-DD form
+    if isinstance(value, str) and value[4:5] == "-":
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            pass
+
+    import aniso8601
+
     try:
         return aniso8601.parse_date(value)
     except ValueError:
         return None
 
 
-GraphQLDate = GraphQLScalarType(
+GraphQLDate = BulkScalarType(
     name="Date",
     description="The `Date` scalar type represents a Date"
     "value as specified by"
     "[iso8601](https://en.wikipedia.org/wiki/ISO_8601).",
+    value_types=(datetime.date, datetime.datetime),
     serialize=date_serialize,
     parse_literal=date_parse_literal,
     parse_value=date_parse_value,
@@ -74,9 +155,10 @@ GraphQLDate = GraphQLScalarType(
 
 
 def time_serialize(time):
-    assert isinstance(time, datetime.time), 'Received not compatible time "{}"'.format(
-        repr(time)
-    )
+    if type(time) is not datetime.time:
+        assert isinstance(
+            time, datetime.time
+        ), 'Received not compatible time "{}"'.format(repr(time))
     return time.isoformat()
 
 
@@ -85,19 +167,212 @@ def time_parse_literal(node):
         return time_parse_value(node.value)
 
 
-def time_parse_value(cls, value):
+def time_parse_value(value):
+    if isinstance(value, str) and value[2:3] == ":":
+        try:
+            return datetime.time.fromisoformat(_fix_utc(value))
+        except ValueError:
+            pass
+
+    import aniso8601
+
     try:
         return aniso8601.parse_time(value)
     except ValueError:
         return None
 
 
-GraphQLTime = GraphQLScalarType(
+GraphQLTime = BulkScalarType(
     name="Time",
     description="The `Time` scalar type represents a Time"
     "value as specified by"
     "[iso8601](https://en.wikipedia.org/wiki/ISO_8601).",
+    value_types=(datetime.time,),
     serialize=time_serialize,
     parse_literal=time_parse_literal,
     parse_value=time_parse_value,
 )
+
+
+# The following scalars follow the conventions of the graphql-core
+# built-in ones: invalid values raise a GraphQLError.
+
+
+def uuid_serialize(value):
+    if type(value) is uuid.UUID:
+        return str(value)
+    if isinstance(value, str):
+        # Normalize to the canonical form
+        return str(uuid_parse_value(value))
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise GraphQLError("UUID cannot represent value: " + inspect(value))
+
+
+def uuid_parse_value(value):
+    if isinstance(value, str):
+        try:
+            return uuid.UUID(value)
+        except ValueError:
+            pass
+    raise GraphQLError("UUID cannot represent value: " + inspect(value))
+
+
+def uuid_parse_literal(node, _variables=None):
+    if isinstance(node, ast.StringValueNode):
+        return uuid_parse_value(node.value)
+    raise GraphQLError("UUID cannot represent value: " + inspect(node), node)
+
+
+GraphQLUUID = BulkScalarType(
+    name="UUID",
+    description="The `UUID` scalar type represents a UUID, as a string in "
+    "the canonical hyphenated form.",
+    value_types=(uuid.UUID,),
+    serialize=uuid_serialize,
+    serialize_item=str,
+    parse_literal=uuid_parse_literal,
+    parse_value=uuid_parse_value,
+)
+
+
+def decimal_serialize(value):
+    # Serialized as a string, so that no precision is lost
+    if isinstance(value, decimal.Decimal) and value.is_finite():
+        return str(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    raise GraphQLError("Decimal cannot represent value: " + inspect(value))
+
+
+def decimal_parse_value(value):
+    if isinstance(value, str):
+        try:
+            result = decimal.Decimal(value)
+        except decimal.InvalidOperation:
+            pass
+        else:
+            if result.is_finite():
+                return result
+    elif isinstance(value, int) and not isinstance(value, bool):
+        return decimal.Decimal(value)
+    elif isinstance(value, float):
+        # Use the shortest representation, rather than the exact value
+        # of the binary float (eg. 0.1, not 0.1000000000000000055511...)
+        result = decimal.Decimal(repr(value))
+        if result.is_finite():
+            return result
+    raise GraphQLError("Decimal cannot represent value: " + inspect(value))
+
+
+def decimal_parse_literal(node, _variables=None):
+    # Literals are parsed from their source text, with no rounding
+    if isinstance(node, (ast.StringValueNode, ast.IntValueNode, ast.FloatValueNode)):
+        return decimal_parse_value(node.value)
+    raise GraphQLError("Decimal cannot represent value: " + inspect(node), node)
+
+
+GraphQLDecimal = BulkScalarType(
+    name="Decimal",
+    description="The `Decimal` scalar type represents an arbitrary "
+    "precision decimal number, as a string.",
+    value_types=(decimal.Decimal,),
+    serialize=decimal_serialize,
+    parse_literal=decimal_parse_literal,
+    parse_value=decimal_parse_value,
+)
+
+
+def bigint_serialize(value):
+    # Serialized as a string, as most JSON parsers (eg. JavaScript's)
+    # can't represent large integers exactly.
+    if type(value) is int:
+        return str(value)
+    if isinstance(value, str):
+        return str(bigint_parse_value(value))
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(int(value))
+    raise GraphQLError("BigInt cannot represent value: " + inspect(value))
+
+
+def bigint_parse_value(value):
+    if type(value) is int:
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    raise GraphQLError("BigInt cannot represent value: " + inspect(value))
+
+
+def bigint_parse_literal(node, _variables=None):
+    if isinstance(node, (ast.IntValueNode, ast.StringValueNode)):
+        return bigint_parse_value(node.value)
+    raise GraphQLError("BigInt cannot represent value: " + inspect(node), node)
+
+
+GraphQLBigInt = BulkScalarType(
+    name="BigInt",
+    description="The `BigInt` scalar type represents an integer of "
+    "arbitrary size, as a string. Integers are accepted as input, too.",
+    value_types=(int,),
+    serialize=bigint_serialize,
+    serialize_item=str,
+    parse_literal=bigint_parse_literal,
+    parse_value=bigint_parse_value,
+)
+
+
+def bytes_serialize(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return binascii.b2a_base64(value, newline=False).decode("ascii")
+    raise GraphQLError("Bytes cannot represent value: " + inspect(value))
+
+
+def bytes_parse_value(value):
+    if isinstance(value, str):
+        try:
+            if _HAS_STRICT_BASE64:
+                return binascii.a2b_base64(value, strict_mode=True)
+            return base64.b64decode(value, validate=True)
+        except ValueError:  # Includes binascii.Error
+            pass
+    raise GraphQLError("Bytes cannot represent value: " + inspect(value))
+
+
+def bytes_parse_literal(node, _variables=None):
+    if isinstance(node, ast.StringValueNode):
+        return bytes_parse_value(node.value)
+    raise GraphQLError("Bytes cannot represent value: " + inspect(node), node)
+
+
+GraphQLBytes = BulkScalarType(
+    name="Bytes",
+    description="The `Bytes` scalar type represents binary data, as a "
+    "base64-encoded string.",
+    value_types=(bytes,),
+    serialize=bytes_serialize,
+    parse_literal=bytes_parse_literal,
+    parse_value=bytes_parse_value,
+)
+
+
+def json_identity(value):
+    return value
+
+
+def json_parse_literal(node, variables=None):
+    return value_from_ast_untyped(node, variables)
+
+
+# Values are passed through as they are (they must be serializable to
+# JSON along with the rest of the result), rather than encoded to, and
+# decoded from, JSON strings.
+GraphQLJSON = GraphQLScalarType(
+    name="JSON",
+    description="The `JSON` scalar type represents arbitrary JSON values.",
+    serialize=json_identity,
+    parse_literal=json_parse_literal,
+    parse_value=json_identity,
+)
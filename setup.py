@@ -38,7 +38,7 @@ DEPENDENCY_LINKS = []
 setup(
     name="PyQL",
     version=version,
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     url="https://github.com/rshk/pyql",
     license="BSD License",
     author="Samuele Santi",
@@ -48,12 +48,12 @@ setup(
     install_requires=INSTALL_REQUIRES,
     dependency_links=DEPENDENCY_LINKS,
     extras_require=EXTRAS_REQUIRE,
+    python_requires=">=3.7",
     # tests_require=tests_require,
     # test_suite='tests',
     classifiers=[
         "License :: OSI Approved :: BSD License",
         "Programming Language :: Python :: 3 :: Only",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
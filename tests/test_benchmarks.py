@@ -0,0 +1,24 @@
+from benchmarks.synthetic import (
+    make_deep_query,
+    make_list_query,
+    make_schema,
+    make_wide_query,
+)
+
+
+def test_synthetic_schema():
+    schema = make_schema()
+    assert len(schema.compiled.query_type.fields) == 100
+
+    for query in (
+        make_wide_query(100, 10),
+        make_deep_query(10, 50),
+        make_list_query(10, 5),
+    ):
+        result = schema.execute(query)
+        assert result.errors is None
+
+
+def test_large_synthetic_schema():
+    schema = make_schema(num_types=1000)
+    assert len(schema.compiled.query_type.fields) == 1000
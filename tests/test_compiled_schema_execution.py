@@ -1,4 +1,7 @@
+import gc
+import weakref
 from collections import namedtuple
+from typing import List
 
 from pyql import Object, Schema
 
@@ -77,6 +80,24 @@ def test_resolver_cannot_return_different_container_instance():
     )
 
 
+def test_different_container_instance_is_not_checked_without_strict_types():
+
+    schema = Schema(strict_types=False)
+
+    Foo = Object("Foo", {"text": str})
+    Bar = Object("Bar", {"text": str})
+
+    @schema.query.field("foo")
+    def resolve_foo(root, info) -> Foo:
+        return Bar(text="a")
+
+    result = schema.execute("{ foo { text } }")
+
+    assert result.errors is None
+    assert result.data == {"foo": {"text": "a"}}
+    assert schema.compiled.get_type("Foo").is_type_of is None
+
+
 def test_returning_an_incompatible_object_fails():
 
     schema = Schema()
@@ -116,3 +137,56 @@ def test_resolver_can_return_dict():
 
     assert result.errors is None
     assert result.data == {"foo": {"text": "a"}}
+
+
+def test_default_resolver_with_missing_values():
+
+    schema = Schema()
+
+    Foo = Object("Foo", {"text": str, "other": str})
+
+    @schema.query.field("foos")
+    def resolve_foos(root, info) -> List[Foo]:
+        return [{"text": "a"}, Foo(text="b"), AnotherFoo(text="c"), None]
+
+    AnotherFoo = namedtuple("AnotherFoo", ("text",))
+
+    result = schema.execute("{ foos { text, other } }")
+
+    assert result.errors is None
+    assert result.data == {
+        "foos": [
+            {"text": "a", "other": None},
+            {"text": "b", "other": None},
+            {"text": "c", "other": None},
+            None,
+        ]
+    }
+
+
+def test_default_resolvers_are_shared_between_fields():
+
+    Foo = Object("Foo", {"text": str})
+    Bar = Object("Bar", {"text": str, "other": str})
+
+    assert Foo.fields["text"].resolver is Bar.fields["text"].resolver
+    assert Foo.fields["text"].resolver is not Bar.fields["other"].resolver
+
+
+def test_default_resolvers_do_not_keep_root_types_alive():
+
+    Foo = Object("Foo", {"text": str})
+    resolver = Foo.fields["text"].resolver
+
+    class Root:
+        text = "a"
+
+    assert resolver(Root(), None) == "a"
+    assert resolver({"text": "b"}, None) == "b"
+
+    root_type = weakref.ref(Root)
+    del Root
+    gc.collect()
+    assert root_type() is None
+
+    assert resolver({"text": "c"}, None) == "c"
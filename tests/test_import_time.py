@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+
+# Cumulative time allowed for ``from pyql import Object, Schema``, in
+# microseconds. Used to be ~60ms, mostly spent importing asyncio.
+IMPORT_TIME_BUDGET = 20000
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+
+def get_top_level_imports(statement):
+    """Get cumulative import times of modules imported by a statement
+    (but not by the modules themselves), in microseconds"""
+
+    result = run_python("-X", "importtime", "-c", statement)
+
+    import_times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split("|")
+        if (
+            len(fields) == 3
+            and fields[1].strip().isdigit()
+            and not fields[2].startswith("  ")
+        ):
+            import_times[fields[2].strip()] = int(fields[1])
+
+    return import_times
+
+
+def get_import_time(statement):
+    """Get cumulative import time of an import statement, in microseconds"""
+
+    # Leave out modules imported on interpreter startup
+    startup = get_top_level_imports("pass")
+    import_times = get_top_level_imports(statement)
+    return sum(
+        import_time
+        for module, import_time in import_times.items()
+        if module not in startup
+    )
+
+
+def test_import_time_within_budget():
+
+    # Take the best of a few runs, to avoid flakiness on busy machines
+    import_time = min(
+        get_import_time("from pyql import Object, Schema") for _ in range(3)
+    )
+
+    assert import_time < IMPORT_TIME_BUDGET
+
+
+def test_defining_schema_does_not_import_graphql():
+
+    code = """
+import sys
+from pyql import Object, Schema
+
+Query = Object("Query")
+
+@Query.field("hello")
+def resolve_hello(root, info, name: str = "world") -> str:
+    return "Hello " + name
+
+schema = Schema(query=Query)
+
+print(" ".join(sorted(
+    name for name in ("graphql", "aniso8601", "asyncio") if name in sys.modules
+)))
+"""
+
+    result = run_python("-c", code)
+    assert result.stdout.strip() == ""
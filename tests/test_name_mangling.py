@@ -101,3 +101,22 @@ def test_input_fields_are_converted_from_snake_case():
 
     assert result.errors is None
     assert result.data == {"hello": "A VALUE"}
+
+
+def test_arguments_are_renamed_without_wrapping_resolvers():
+
+    schema = Schema()
+
+    @schema.query.field("hello")
+    def resolve_hello(root, info, some_arg_name: str, other: str = "X") -> str:
+        return "{} {}".format(some_arg_name, other)
+
+    field = schema.compiled.query_type.fields["hello"]
+    assert field.resolve is resolve_hello.resolver
+    assert field.args["someArgName"].out_name == "some_arg_name"
+    assert field.args["other"].out_name is None
+
+    result = schema.execute('{ hello(someArgName: "A", other: "B") }')
+
+    assert result.errors is None
+    assert result.data == {"hello": "A B"}
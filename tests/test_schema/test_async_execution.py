@@ -0,0 +1,158 @@
+import asyncio
+import threading
+
+import pytest
+
+from pyql import Schema
+
+
+def test_execute_async():
+
+    schema = Schema()
+
+    @schema.query.field("hello")
+    async def resolve_hello(root, info, name: str = "world") -> str:
+        await asyncio.sleep(0)
+        return "Hello {}".format(name)
+
+    async def run():
+        return [
+            await schema.execute_async(
+                "query ($name: String) { hello(name: $name) }",
+                variable_values={"name": name},
+            )
+            for name in ("A", "B")
+        ]
+
+    results = asyncio.run(run())
+
+    assert [r.errors for r in results] == [None, None]
+    assert [r.data for r in results] == [{"hello": "Hello A"}, {"hello": "Hello B"}]
+
+    info = schema.cache_info()
+    assert info["compiled"]["recompiles"] == 1
+    assert info["documents"]["hits"] == 1
+
+
+def test_execute_async_with_sync_resolvers():
+
+    schema = Schema()
+
+    @schema.query.field("hello")
+    def resolve_hello(root, info) -> str:
+        return "Hello world"
+
+    result = asyncio.run(schema.execute_async("{ hello }"))
+
+    assert result.errors is None
+    assert result.data == {"hello": "Hello world"}
+
+
+def test_execute_with_sync_false_returns_coroutine():
+
+    schema = Schema()
+
+    @schema.query.field("hello")
+    def resolve_hello(root, info) -> str:
+        return "Hello world"
+
+    coro = schema.execute("{ hello }", sync=False)
+    result = asyncio.run(coro)
+
+    assert result.data == {"hello": "Hello world"}
+
+
+def test_resolvers_run_concurrently():
+
+    schema = Schema()
+
+    @schema.query.field("first")
+    async def resolve_first(root, info) -> str:
+        event = info.context["event"]
+        # Would wait forever if "second" was not running concurrently
+        await event.wait()
+        return "first"
+
+    @schema.query.field("second")
+    async def resolve_second(root, info) -> str:
+        info.context["event"].set()
+        return "second"
+
+    async def run():
+        context = {"event": asyncio.Event()}
+        return await schema.execute_async(
+            "{ first, second }", context_value=context, timeout=5
+        )
+
+    result = asyncio.run(run())
+
+    assert result.errors is None
+    assert result.data == {"first": "first", "second": "second"}
+
+
+def test_execute_async_timeout_cancels_resolvers():
+
+    schema = Schema()
+    cancelled = []
+
+    @schema.query.field("slow")
+    async def resolve_slow(root, info) -> str:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "done"
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(schema.execute_async("{ slow }", timeout=0.01))
+
+    assert cancelled == [True]
+
+
+def test_execute_async_can_be_cancelled():
+
+    schema = Schema()
+    started = []
+    cancelled = []
+
+    @schema.query.field("slow")
+    async def resolve_slow(root, info) -> str:
+        started.append(True)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "done"
+
+    async def run():
+        task = asyncio.ensure_future(schema.execute_async("{ slow }"))
+        while not started:
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+    assert cancelled == [True]
+
+
+def test_sync_execution_of_coroutine_resolvers_in_thread():
+
+    schema = Schema()
+
+    @schema.query.field("hello")
+    async def resolve_hello(root, info) -> str:
+        return "Hello world"
+
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(schema.execute("{ hello }"))
+    )
+    thread.start()
+    thread.join()
+
+    assert results[0].errors is None
+    assert results[0].data == {"hello": "Hello world"}
@@ -0,0 +1,322 @@
+import asyncio
+import gc
+from typing import List
+
+from graphql import graphql
+
+from pyql import Object, Schema
+from pyql.schema.batching import DataLoader, LoaderRegistry
+
+USERS = {1: "Alice", 2: "Bob", 3: "Carol"}
+
+POSTS = [
+    {"title": "One", "author_id": 1},
+    {"title": "Two", "author_id": 2},
+    {"title": "Three", "author_id": 1},
+    {"title": "Four", "author_id": None},
+]
+
+
+def make_schema(load_users, batch_key="author_id"):
+
+    User = Object("User", {"id": int, "name": str})
+    Post = Object("Post", {"title": str})
+
+    Post.define_field("author", User, resolver=load_users, batch_key=batch_key)
+
+    schema = Schema()
+
+    @schema.query.field("posts")
+    def resolve_posts(root, info) -> List[Post]:
+        return POSTS
+
+    return schema
+
+
+def test_batch_resolver_receives_all_keys():
+
+    calls = []
+
+    def load_users(keys, info):
+        calls.append(keys)
+        return [{"id": key, "name": USERS[key]} for key in keys]
+
+    schema = make_schema(load_users)
+
+    result = schema.execute("{ posts { title, author { name } } }")
+
+    assert result.errors is None
+    assert result.data == {
+        "posts": [
+            {"title": "One", "author": {"name": "Alice"}},
+            {"title": "Two", "author": {"name": "Bob"}},
+            {"title": "Three", "author": {"name": "Alice"}},
+            {"title": "Four", "author": None},
+        ]
+    }
+
+    # Keys are de-duplicated, None keys are skipped
+    assert calls == [[1, 2]]
+
+
+def test_batch_key_can_be_a_function():
+
+    calls = []
+
+    def load_users(keys, info):
+        calls.append(keys)
+        return [{"id": key, "name": USERS[key]} for key in keys]
+
+    schema = make_schema(load_users, batch_key=lambda post: post["author_id"])
+
+    result = schema.execute("{ posts { author { id } } }")
+
+    assert result.errors is None
+    assert [post["author"] for post in result.data["posts"]] == [
+        {"id": 1},
+        {"id": 2},
+        {"id": 1},
+        None,
+    ]
+    assert calls == [[1, 2]]
+
+
+def test_async_batch_resolver():
+
+    calls = []
+
+    async def load_users(keys, info):
+        calls.append(keys)
+        await asyncio.sleep(0)
+        return [{"id": key, "name": USERS[key]} for key in keys]
+
+    schema = make_schema(load_users)
+
+    result = asyncio.run(schema.execute_async("{ posts { author { name } } }"))
+
+    assert result.errors is None
+    assert [post["author"] for post in result.data["posts"]] == [
+        {"name": "Alice"},
+        {"name": "Bob"},
+        {"name": "Alice"},
+        None,
+    ]
+    assert calls == [[1, 2]]
+
+
+def test_async_batch_tasks_are_kept_until_done():
+
+    async def load(keys):
+        await asyncio.sleep(0.01)
+        return [key * 2 for key in keys]
+
+    async def main():
+        loader = DataLoader(load)
+        future = loader.load(21)
+        await asyncio.sleep(0)
+        assert len(loader._tasks) == 1
+
+        # The event loop only references tasks weakly
+        gc.collect()
+        assert await future == 42
+        await asyncio.sleep(0)
+        assert not loader._tasks
+
+    asyncio.run(main())
+
+
+def test_loaders_are_request_scoped():
+
+    calls = []
+
+    def load_users(keys, info):
+        calls.append(keys)
+        return [{"id": key, "name": USERS[key]} for key in keys]
+
+    schema = make_schema(load_users)
+
+    schema.execute("{ posts { author { name } } }")
+    schema.execute("{ posts { author { name } } }")
+
+    assert calls == [[1, 2], [1, 2]]
+
+
+def test_batch_resolver_with_arguments():
+
+    calls = []
+
+    User = Object("User", {"id": int, "name": str})
+    Number = Object("Number", {"value": int})
+
+    @Number.field("user", batch_key="value")
+    def load_users(keys, info, upper_case: bool = False) -> User:
+        calls.append((keys, upper_case))
+        names = [USERS[key] for key in keys]
+        if upper_case:
+            names = [name.upper() for name in names]
+        return [{"id": key, "name": name} for key, name in zip(keys, names)]
+
+    schema = Schema()
+
+    @schema.query.field("numbers")
+    def resolve_numbers(root, info) -> List[Number]:
+        return [{"value": 1}, {"value": 2}, {"value": 3}]
+
+    result = schema.execute("""
+        {
+            numbers {
+                user { name }
+                upper: user(upperCase: true) { name }
+            }
+        }
+        """)
+
+    assert result.errors is None
+    assert result.data == {
+        "numbers": [
+            {"user": {"name": "Alice"}, "upper": {"name": "ALICE"}},
+            {"user": {"name": "Bob"}, "upper": {"name": "BOB"}},
+            {"user": {"name": "Carol"}, "upper": {"name": "CAROL"}},
+        ]
+    }
+    assert sorted(calls) == [([1, 2, 3], False), ([1, 2, 3], True)]
+
+
+def test_batch_resolver_receives_info_for_its_keys():
+
+    calls = []
+
+    User = Object("User", {"id": int, "name": str})
+    Post = Object("Post", {"title": str})
+
+    @Post.field("author", batch_key="author_id")
+    def load_users(keys, info) -> User:
+        aliases = [(node.alias or node.name).value for node in info.field_nodes]
+        calls.append((aliases, info.path.as_list(), keys))
+        return [{"id": key, "name": USERS[key]} for key in keys]
+
+    schema = Schema()
+
+    @schema.query.field("posts")
+    def resolve_posts(root, info) -> List[Post]:
+        return POSTS
+
+    @schema.query.field("post")
+    def resolve_post(root, info) -> Post:
+        return POSTS[1]
+
+    result = schema.execute(
+        "{ posts { a: author { name } b: author { id } } post { author { name } } }"
+    )
+
+    assert result.errors is None
+    assert result.data["post"] == {"author": {"name": "Bob"}}
+
+    # One batch per field in the query
+    assert sorted(calls) == [
+        (["a"], ["posts", 0, "a"], [1, 2]),
+        (["author"], ["post", "author"], [2]),
+        (["b"], ["posts", 0, "b"], [1, 2]),
+    ]
+
+
+def test_batch_resolver_errors():
+
+    def load_users(keys, info):
+        return [
+            ValueError("No such user") if key == 2 else {"name": USERS[key]}
+            for key in keys
+        ]
+
+    schema = make_schema(load_users)
+
+    result = schema.execute("{ posts { author { name } } }")
+
+    assert [post["author"] for post in result.data["posts"]] == [
+        {"name": "Alice"},
+        None,
+        {"name": "Alice"},
+        None,
+    ]
+    assert len(result.errors) == 1
+    assert result.errors[0].message == "No such user"
+    assert result.errors[0].path == ["posts", 1, "author"]
+
+
+def test_batch_resolver_must_return_one_value_per_key():
+
+    def load_users(keys, info):
+        return []
+
+    schema = make_schema(load_users)
+
+    result = schema.execute("{ posts { author { name } } }")
+
+    assert len(result.errors) == 3
+    assert result.errors[0].message == (
+        "Batch resolver must return a list with one value per key "
+        "(expected 2, got 0)"
+    )
+
+
+def test_loader_registry_context_manager():
+
+    calls = []
+
+    def load_users(keys, info):
+        calls.append(keys)
+        return [{"name": USERS[key]} for key in keys]
+
+    schema = make_schema(load_users)
+
+    async def run():
+        with LoaderRegistry():
+            return await graphql(schema.compiled, "{ posts { author { name } } }")
+
+    result = asyncio.run(run())
+
+    assert result.errors is None
+    assert calls == [[1, 2]]
+
+
+def test_batch_field_receives_all_roots():
+
+    calls = []
+
+    Post = Object("Post", {"title": str})
+    User = Object("User", {"name": str, "posts": List[Post]})
+
+    @User.batch_field("name_length")
+    def resolve_name_length(roots, info) -> int:
+        calls.append(("name_length", [root["name"] for root in roots]))
+        return [len(root["name"]) for root in roots]
+
+    @Post.batch_field("shout")
+    def resolve_shout(roots, info, suffix: str = "!") -> str:
+        calls.append(("shout", [root["title"] for root in roots]))
+        return [root["title"].upper() + suffix for root in roots]
+
+    schema = Schema()
+
+    @schema.query.field("users")
+    def resolve_users(root, info) -> List[User]:
+        return [
+            {"name": "Alice", "posts": [{"title": "one"}, {"title": "two"}]},
+            {"name": "Bob", "posts": [{"title": "three"}]},
+        ]
+
+    result = schema.execute("{ users { nameLength, posts { shout } } }")
+
+    assert result.errors is None
+    assert result.data == {
+        "users": [
+            {"nameLength": 5, "posts": [{"shout": "ONE!"}, {"shout": "TWO!"}]},
+            {"nameLength": 3, "posts": [{"shout": "THREE!"}]},
+        ]
+    }
+
+    # Called once per level, with all the roots
+    assert calls == [
+        ("name_length", ["Alice", "Bob"]),
+        ("shout", ["one", "two", "three"]),
+    ]
@@ -0,0 +1,162 @@
+import pytest
+
+from pyql import InputObject, Object, Schema
+
+
+def test_compiled_schema_is_reused():
+
+    schema = Schema()
+
+    @schema.query.field("hello")
+    def resolve_hello(root, info) -> str:
+        return "Hello world"
+
+    compiled = schema.compiled
+
+    assert schema.compiled is compiled
+    assert schema.execute("{hello}").data == {"hello": "Hello world"}
+    assert schema.execute("{hello}").data == {"hello": "Hello world"}
+    assert schema.compiled is compiled
+
+    assert schema.cache_info()["compiled"] == {"hits": 4, "recompiles": 1}
+
+
+def test_compiled_schema_is_invalidated_by_new_fields():
+
+    schema = Schema()
+
+    @schema.query.field("hello")
+    def resolve_hello(root, info) -> str:
+        return "Hello world"
+
+    compiled = schema.compiled
+
+    @schema.query.field("goodbye")
+    def resolve_goodbye(root, info) -> str:
+        return "Goodbye world"
+
+    assert schema.compiled is not compiled
+
+    result = schema.execute("{hello, goodbye}")
+    assert result.errors is None
+    assert result.data == {"hello": "Hello world", "goodbye": "Goodbye world"}
+
+    assert schema.cache_info()["compiled"] == {"hits": 1, "recompiles": 2}
+
+
+def test_compiled_schema_is_invalidated_by_set_query():
+
+    schema = Schema()
+
+    @schema.query.field("hello")
+    def resolve_hello(root, info) -> str:
+        return "Hello world"
+
+    assert schema.execute("{hello}").data == {"hello": "Hello world"}
+
+    Query = Object("Query")
+
+    @Query.field("hello")
+    def resolve_other_hello(root, info) -> str:
+        return "Hello there"
+
+    schema.set_query(Query)
+
+    assert schema.execute("{hello}").data == {"hello": "Hello there"}
+
+
+def test_compiled_schema_is_invalidated_by_nested_object_changes():
+
+    schema = Schema()
+
+    Post = Object("Post", {"title": str})
+
+    @schema.query.field("post")
+    def resolve_post(root, info) -> Post:
+        return {"title": "One", "body": "First post"}
+
+    result = schema.execute("{post {title}}")
+    assert result.data == {"post": {"title": "One"}}
+
+    Post.define_field("body", str)
+
+    result = schema.execute("{post {title, body}}")
+    assert result.errors is None
+    assert result.data == {"post": {"title": "One", "body": "First post"}}
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_compiled_schema_tracks_all_definitions(lazy):
+
+    PostFilter = InputObject("PostFilter", fields={"title": str})
+    Post = Object("Post", {"title": str})
+    schema = Schema(lazy=lazy)
+
+    @schema.query.field("posts")
+    def resolve_posts(root, info, filter: PostFilter = None) -> Post:
+        return {"title": "One"}
+
+    compiled = schema.compiled
+    PostFilter.define_field("author", str)
+    assert schema.compiled is not compiled
+
+    compiled = schema.compiled
+    Post.define_field("body", str)
+    assert schema.compiled is not compiled
+
+    # Root objects without fields are not compiled at all
+    compiled = schema.compiled
+    schema.mutation.define_field("publish", bool)
+    assert schema.compiled is not compiled
+    assert "publish" in schema.compiled.mutation_type.fields
+
+
+def test_compiled_schema_is_not_invalidated_by_unrelated_changes():
+
+    schema = Schema()
+
+    @schema.query.field("hello")
+    def resolve_hello(root, info) -> str:
+        return "Hello world"
+
+    compiled = schema.compiled
+
+    Other = Object("Other")
+    Other.define_field("name", str)
+
+    other_schema = Schema()
+    other_schema.query.define_field("other", Other)
+    assert other_schema.execute("{ other { name } }").errors is None
+
+    assert schema.compiled is compiled
+    assert schema.cache_info()["compiled"] == {"hits": 1, "recompiles": 1}
+
+
+def test_compiled_schema_is_invalidated_by_attribute_changes():
+
+    schema = Schema()
+
+    @schema.query.field("hello")
+    def resolve_hello(root, info) -> str:
+        return "Hello world"
+
+    assert schema.execute("{hello}").data == {"hello": "Hello world"}
+
+    Query = Object("Query")
+
+    @Query.field("hello")
+    def resolve_other_hello(root, info) -> str:
+        return "Hello there"
+
+    schema.query = Query
+    assert schema.execute("{hello}").data == {"hello": "Hello there"}
+
+    compiled = schema.compiled
+    schema.strict_types = False
+    assert schema.compiled is not compiled
+
+    schema.naming = "identity"
+    Query.define_field("some_field", str)
+    assert "some_field" in schema.compiled.query_type.fields
+
+    assert schema.cache_info()["compiled"]["recompiles"] == 4
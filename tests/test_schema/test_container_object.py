@@ -1,4 +1,6 @@
-from pyql import Object
+import pytest
+
+from pyql import InputObject, Object, Schema
 
 
 def test_container_object_is_instance_of_object():
@@ -7,3 +9,72 @@ def test_container_object_is_instance_of_object():
     obj = MyObject(foo="A")
 
     assert isinstance(obj, MyObject)
+
+
+def test_slots_container_object():
+    MyObject = Object("MyObject", fields={"foo": str, "bar": str}, slots=True)
+
+    obj = MyObject(foo="A")
+
+    assert isinstance(obj, MyObject)
+    assert not hasattr(obj, "__dict__")
+    assert (obj.foo, obj.bar) == ("A", None)
+
+    obj = MyObject("A", bar="B")
+    assert (obj.foo, obj.bar) == ("A", "B")
+
+    with pytest.raises(TypeError):
+        MyObject(baz="C")
+
+    with pytest.raises(AttributeError):
+        obj.baz = "C"
+
+
+def test_slots_container_object_with_keyword_field_names():
+    MyObject = Object("MyObject", fields={"from": str, "to": str}, slots=True)
+
+    obj = MyObject("A", **{"to": "B"})
+    assert (getattr(obj, "from"), obj.to) == ("A", "B")
+
+    with pytest.raises(TypeError):
+        MyObject(**{"baz": "C"})
+
+
+def test_slots_container_object_with_self_field():
+    MyObject = Object("MyObject", fields={"self": str, "other": str}, slots=True)
+
+    obj = MyObject("A", other="B")
+    assert not hasattr(obj, "__dict__")
+    assert (obj.self, obj.other) == ("A", "B")
+
+    obj = MyObject.container_type._from_dict({"self": "C"})
+    assert (obj.self, obj.other) == ("C", None)
+
+
+def test_slots_container_object_with_reserved_field_names():
+    # Would clash with members of the container type
+    MyObject = Object("MyObject", fields={"_from_dict": str, "__x": str}, slots=True)
+
+    obj = MyObject(_from_dict="A", __x="B")
+    assert (obj._from_dict, getattr(obj, "__x")) == ("A", "B")
+
+    obj = MyObject.container_type._from_dict({"_from_dict": "C"})
+    assert obj._from_dict == "C"
+
+
+def test_slots_container_object_execution():
+
+    Post = Object("Post", {"title": str, "body": str}, slots=True)
+    PostInput = InputObject("PostInput", {"title": str, "body": str}, slots=True)
+
+    schema = Schema()
+
+    @schema.query.field("echo")
+    def resolve_echo(root, info, post: PostInput) -> Post:
+        assert isinstance(post, PostInput)
+        return Post(title=post.title, body=post.body)
+
+    result = schema.execute('{ echo(post: {title: "One"}) { title, body } }')
+
+    assert result.errors is None
+    assert result.data == {"echo": {"title": "One", "body": None}}
@@ -0,0 +1,193 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from pyql import ID, Object, Schema
+
+
+def make_schema(calls, **kwargs):
+
+    User = Object("User", {"id": ID, "name": str})
+
+    @User.field("friends")
+    def resolve_friends(root, info, first: int = 10) -> List[User]:
+        calls.append("friends")
+        return [User(id=str(i), name="Friend {}".format(i)) for i in range(first)]
+
+    @User.field("score", cost=5)
+    def resolve_score(root, info) -> float:
+        return 1.0
+
+    Query = Object("Query")
+
+    @Query.field("users", cost=2)
+    def resolve_users(root, info, limit: int = None) -> List[User]:
+        calls.append("users")
+        return [User(id="1", name="Alice")]
+
+    @Query.field("me")
+    def resolve_me(root, info) -> User:
+        calls.append("me")
+        return User(id="1", name="Alice")
+
+    return Schema(query=Query, **kwargs)
+
+
+def get_cost(schema, query, variable_values=None, operation_name=None):
+    from pyql.schema.execution import get_document
+
+    cached = get_document(schema._document_cache, schema.compiled, query)
+    cost = cached.get_cost(schema.compiled, operation_name)
+    return cost.get_cost(variable_values), cost.depth
+
+
+@pytest.mark.parametrize(
+    "query,variable_values,expected",
+    [
+        ("{ me { id name } }", None, (1, 2)),
+        ("{ me { id score } }", None, (6, 2)),
+        # Default value for "first" is 10
+        ("{ me { friends { score } } }", None, (1 + 1 + 10 * 5, 3)),
+        ("{ me { friends(first: 3) { score } } }", None, (1 + 1 + 3 * 5, 3)),
+        # No limit: counted once
+        ("{ users { id } }", None, (2, 2)),
+        ("{ users(limit: 4) { friends(first: 5) { id } } }", None, (2 + 4 * 1, 3)),
+        (
+            "query ($n: Int) { users(limit: $n) { score } }",
+            {"n": 100},
+            (2 + 100 * 5, 2),
+        ),
+        ("query ($n: Int = 3) { users(limit: $n) { score } }", None, (2 + 3 * 5, 2)),
+        ("query ($n: Int) { users(limit: $n) { score } }", None, (2 + 5, 2)),
+        (
+            "{ me { ...F } } fragment F on User { friends(first: 2) { ...G } } "
+            "fragment G on User { score }",
+            None,
+            (1 + 1 + 2 * 5, 3),
+        ),
+        ("{ me { ... on User { score } } }", None, (6, 2)),
+        # __typename is a scalar
+        ("{ __typename me { __typename } }", None, (1, 1)),
+        # Other introspection fields are counted as usual
+        ("{ __schema { types { name } } }", None, (2, 3)),
+        ('{ __type(name: "User") { fields { type { name } } } }', None, (3, 4)),
+    ],
+)
+def test_query_cost(query, variable_values, expected):
+    schema = make_schema([])
+    assert get_cost(schema, query, variable_values) == expected
+
+
+def test_cost_of_named_operation():
+    schema = make_schema([])
+    query = "query A { me { id } } query B { users(limit: 10) { score } }"
+
+    assert get_cost(schema, query, operation_name="A") == (1, 2)
+    assert get_cost(schema, query, operation_name="B") == (52, 2)
+
+
+def test_deep_introspection_query_is_rejected():
+    schema = make_schema([], max_depth=3)
+
+    result = schema.execute(
+        "{ __schema { types { fields { type { fields { type { name } } } } } } }"
+    )
+    assert result.data is None
+    assert result.errors[0].extensions == {"code": "QUERY_TOO_DEEP", "maxDepth": 3}
+
+    result = schema.execute("{ __schema { types { name } } }")
+    assert result.errors is None
+
+
+def test_query_over_max_cost_is_rejected():
+    calls = []
+    schema = make_schema(calls, max_cost=60)
+
+    result = schema.execute("{ users(limit: 10) { score } }")
+    assert result.errors is None
+    assert calls == ["users"]
+
+    result = schema.execute("{ users(limit: 100) { score } }")
+    assert result.data is None
+    assert len(result.errors) == 1
+    assert result.errors[0].message == (
+        "Query is too complex: maximum allowed cost is 60"
+    )
+    assert result.errors[0].extensions == {"code": "QUERY_TOO_COMPLEX", "maxCost": 60}
+    assert calls == ["users"]
+
+
+def test_query_over_max_depth_is_rejected():
+    calls = []
+    schema = make_schema(calls, max_depth=3)
+
+    result = schema.execute("{ me { friends { friends { id } } } }")
+    assert result.data is None
+    assert result.errors[0].message == "Query is too deep: maximum allowed depth is 3"
+    assert result.errors[0].extensions == {"code": "QUERY_TOO_DEEP", "maxDepth": 3}
+    assert calls == []
+
+
+def test_cost_is_checked_against_variables():
+    calls = []
+    schema = make_schema(calls, max_cost=50)
+    query = "query ($n: Int) { users(limit: $n) { score } }"
+
+    result = schema.execute(query, variable_values={"n": 100})
+    assert result.errors[0].extensions["code"] == "QUERY_TOO_COMPLEX"
+
+    result = schema.execute(query, variable_values={"n": 1})
+    assert result.errors is None
+    assert calls == ["users"]
+
+    assert schema.cache_info()["documents"]["misses"] == 1
+
+
+def test_limits_can_be_overridden_per_execution():
+    schema = make_schema([], max_cost=1)
+
+    result = schema.execute("{ users(limit: 100) { score } }", max_cost=None)
+    assert result.errors is None
+
+
+def test_limits_apply_to_async_execution():
+    calls = []
+    schema = make_schema(calls, max_cost=1)
+
+    result = asyncio.run(schema.execute_async("{ users(limit: 100) { score } }"))
+    assert result.errors[0].extensions["code"] == "QUERY_TOO_COMPLEX"
+    assert calls == []
+
+
+def make_fragments_query(num_fragments):
+    # Each fragment spreads the previous one twice, so the fully
+    # expanded query has 2 ** num_fragments leaves
+    fragments = ["fragment F0 on User { id }"]
+    for i in range(1, num_fragments + 1):
+        fragments.append(
+            "fragment F{i} on User {{ "
+            "a: friends(first: 1) {{ ...F{j} }} "
+            "b: friends(first: 1) {{ ...F{j} }} }}".format(i=i, j=i - 1)
+        )
+    return "{{ me {{ ...F{} }} }} {}".format(num_fragments, " ".join(fragments))
+
+
+def test_nested_fragments_are_analyzed_once():
+    schema = make_schema([])
+    query = make_fragments_query(40)
+
+    # Each level of fragments costs 2 * (1 + cost of the previous one)
+    assert get_cost(schema, query) == (1 + 2**41 - 2, 42)
+
+
+@pytest.mark.parametrize("limits", [{"max_depth": 5}, {"max_cost": 100}])
+def test_nested_fragments_are_rejected(limits):
+    calls = []
+    schema = make_schema(calls, **limits)
+
+    result = schema.execute(make_fragments_query(40))
+
+    assert result.data is None
+    assert len(result.errors) == 1
+    assert calls == []
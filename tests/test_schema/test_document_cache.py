@@ -0,0 +1,97 @@
+from pyql import Schema
+
+
+def make_schema(**kwargs):
+    schema = Schema(**kwargs)
+
+    @schema.query.field("hello")
+    def resolve_hello(root, info, name: str = "world") -> str:
+        return "Hello {}".format(name)
+
+    return schema
+
+
+def test_repeated_queries_hit_the_cache():
+
+    schema = make_schema()
+
+    for name in ("A", "B", "C"):
+        result = schema.execute(
+            "query ($name: String) { hello(name: $name) }",
+            variable_values={"name": name},
+        )
+        assert result.errors is None
+        assert result.data == {"hello": "Hello {}".format(name)}
+
+    info = schema.cache_info()["documents"]
+    assert info["misses"] == 1
+    assert info["hits"] == 2
+    assert info["size"] == 1
+
+
+def test_validation_errors_are_cached():
+
+    schema = make_schema()
+
+    for _ in range(2):
+        result = schema.execute("{ goodbye }")
+        assert result.data is None
+        assert len(result.errors) == 1
+        assert result.errors[0].message == (
+            "Cannot query field 'goodbye' on type 'Query'."
+        )
+
+    for _ in range(2):
+        result = schema.execute("{ hello ")
+        assert result.data is None
+        assert len(result.errors) == 1
+        assert result.errors[0].message.startswith("Syntax Error")
+
+    info = schema.cache_info()["documents"]
+    assert info["misses"] == 2
+    assert info["hits"] == 2
+
+
+def test_least_recently_used_documents_are_evicted():
+
+    schema = make_schema(document_cache_size=2)
+
+    schema.execute('{ hello(name: "A") }')
+    schema.execute('{ hello(name: "B") }')
+    schema.execute('{ hello(name: "A") }')
+    schema.execute('{ hello(name: "C") }')  # Evicts "B"
+    schema.execute('{ hello(name: "A") }')
+    schema.execute('{ hello(name: "B") }')
+
+    info = schema.cache_info()["documents"]
+    assert info["size"] == 2
+    assert info["maxsize"] == 2
+    assert info["hits"] == 2
+    assert info["misses"] == 4
+
+
+def test_document_cache_can_be_disabled():
+
+    schema = make_schema(document_cache_size=0)
+
+    for _ in range(2):
+        assert schema.execute("{ hello }").data == {"hello": "Hello world"}
+
+    info = schema.cache_info()["documents"]
+    assert info["size"] == 0
+    assert info["hits"] == 0
+
+
+def test_document_cache_is_cleared_on_recompile():
+
+    schema = make_schema()
+    schema.execute("{ hello }")
+
+    @schema.query.field("goodbye")
+    def resolve_goodbye(root, info) -> str:
+        return "Goodbye"
+
+    result = schema.execute("{ hello, goodbye }")
+    assert result.errors is None
+    assert result.data == {"hello": "Hello world", "goodbye": "Goodbye"}
+    assert schema.cache_info()["documents"]["size"] == 1
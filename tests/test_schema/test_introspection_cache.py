@@ -0,0 +1,153 @@
+import pytest
+from graphql import get_introspection_query
+
+import pyql.schema.execution
+from pyql import Object, Schema
+
+
+@pytest.fixture
+def execute_calls(monkeypatch):
+    calls = []
+    execute = pyql.schema.execution.execute
+
+    def counting_execute(*args, **kwargs):
+        calls.append(args)
+        return execute(*args, **kwargs)
+
+    monkeypatch.setattr(pyql.schema.execution, "execute", counting_execute)
+    return calls
+
+
+def make_schema(**kwargs):
+
+    schema = Schema(**kwargs)
+
+    @schema.query.field("hello")
+    def resolve_hello(root, info, name: str = "world") -> str:
+        return "Hello {}".format(name)
+
+    return schema
+
+
+def test_introspection_query_is_cached(execute_calls):
+    schema = make_schema()
+    query = get_introspection_query()
+
+    first = schema.execute(query)
+    second = schema.execute(query)
+
+    assert first.errors is None
+    assert second.data == first.data
+    assert len(execute_calls) == 1
+
+
+def test_cached_results_can_be_modified(execute_calls):
+    schema = make_schema()
+    query = "{ __schema { queryType { name } } }"
+
+    schema.execute(query).data["__schema"]["queryType"]["name"] = "HACKED"
+    schema.execute(query).data["__schema"] = None
+
+    assert schema.execute(query).data == {"__schema": {"queryType": {"name": "Query"}}}
+    assert len(execute_calls) == 1
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "{ __typename }",
+        '{ __type(name: "Query") { name } }',
+        "{ ...F } fragment F on Query { __schema { queryType { name } } }",
+        "{ ... on Query { __typename } }",
+    ],
+)
+def test_introspection_only_operations_are_cached(execute_calls, query):
+    schema = make_schema()
+
+    results = [schema.execute(query) for _ in range(3)]
+
+    assert results[0].errors is None
+    assert len(execute_calls) == 1
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "{ __typename hello }",
+        "{ ...F } fragment F on Query { __typename hello }",
+        "{ ... on Query { hello } }",
+    ],
+)
+def test_other_operations_are_not_cached(execute_calls, query):
+    schema = make_schema()
+
+    for _ in range(3):
+        schema.execute(query)
+
+    assert len(execute_calls) == 3
+
+
+def test_results_are_cached_by_variables(execute_calls):
+    schema = make_schema()
+    query = "query ($name: String!) { __type(name: $name) { name kind } }"
+
+    for _ in range(2):
+        for name in ("Query", "String", "Nope"):
+            result = schema.execute(query, variable_values={"name": name})
+            assert result.errors is None
+
+    assert len(execute_calls) == 3
+    assert result.data == {"__type": None}
+
+
+def test_results_are_cached_by_operation_name(execute_calls):
+    schema = make_schema()
+    query = 'query A { __typename } query B { __type(name: "Query") { kind } }'
+
+    for _ in range(2):
+        assert schema.execute(query, operation_name="A").data == {"__typename": "Query"}
+        assert schema.execute(query, operation_name="B").data == {
+            "__type": {"kind": "OBJECT"}
+        }
+
+    assert len(execute_calls) == 2
+
+
+def test_cache_is_invalidated_with_the_compiled_schema(execute_calls):
+    schema = make_schema()
+    query = "{ __schema { queryType { fields { name } } } }"
+
+    result = schema.execute(query)
+    assert result.data["__schema"]["queryType"]["fields"] == [{"name": "hello"}]
+
+    Other = Object("Other")
+    Other.define_field("field", str)
+    schema.query.define_field("other", Other)
+
+    result = schema.execute(query)
+    assert result.data["__schema"]["queryType"]["fields"] == [
+        {"name": "hello"},
+        {"name": "other"},
+    ]
+    assert len(execute_calls) == 2
+
+
+def test_middleware_disables_caching(execute_calls):
+    schema = make_schema()
+
+    def middleware(next_, root, info, **kwargs):
+        return next_(root, info, **kwargs)
+
+    for _ in range(2):
+        schema.execute("{ __typename }", middleware=[middleware])
+
+    assert len(execute_calls) == 2
+
+
+def test_cached_results_are_not_traced():
+    schema = make_schema(tracing=True)
+
+    for _ in range(2):
+        result = schema.execute("{ __typename }")
+        assert result.data == {"__typename": "Query"}
+        assert result.extensions is None
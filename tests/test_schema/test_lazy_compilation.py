@@ -0,0 +1,106 @@
+import pytest
+
+from pyql import ID, Interface, Object, Schema
+
+
+def make_schema(lazy):
+
+    Character = Interface("Character", fields={"id": ID, "name": str})
+
+    Human = Object(
+        "Human",
+        interfaces=[Character],
+        fields={"id": ID, "name": str, "home_planet": str},
+    )
+
+    Droid = Object(
+        "Droid",
+        interfaces=[Character],
+        fields={"id": ID, "name": str, "primary_function": str},
+    )
+
+    Starship = Object("Starship", fields={"name": str, "length": float})
+
+    Query = Object("Query")
+
+    @Query.field("hero")
+    def resolve_hero(root, info) -> Character:
+        return Droid(id="2001", name="R2-D2", primary_function="Astromech")
+
+    @Query.field("starship")
+    def resolve_starship(root, info) -> Starship:
+        return Starship(name="Millennium Falcon", length=34.37)
+
+    @Query.field("hello")
+    def resolve_hello(root, info) -> str:
+        return "Hello world"
+
+    return Schema(query=Query, types=[Human, Droid], lazy=lazy)
+
+
+QUERY = """
+{
+  hero {
+    id
+    name
+    ... on Droid { primaryFunction }
+    ... on Human { homePlanet }
+  }
+}
+"""
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_lazy_and_eager_results_match(lazy):
+
+    result = make_schema(lazy).execute(QUERY)
+
+    assert result.errors is None
+    assert result.data == {
+        "hero": {"id": "2001", "name": "R2-D2", "primaryFunction": "Astromech"}
+    }
+
+
+def test_lazy_schema_compiles_only_reached_types():
+
+    eager = make_schema(lazy=False)
+    eager.execute("{ hello }")
+
+    lazy = make_schema(lazy=True)
+    result = lazy.execute("{ hello }")
+
+    assert result.errors is None
+    assert result.data == {"hello": "Hello world"}
+
+    # Query, Character, Human, Droid, Starship
+    assert eager.cache_info()["types"] == 5
+    # Query only
+    assert lazy.cache_info()["types"] == 1
+
+    result = lazy.execute("{ starship { name } }")
+    assert result.data == {"starship": {"name": "Millennium Falcon"}}
+    assert lazy.cache_info()["types"] == 2
+
+
+def test_lazy_schema_validates_queries():
+
+    result = make_schema(lazy=True).execute("{ starship { width } }")
+
+    assert result.data is None
+    assert len(result.errors) == 1
+    assert "Cannot query field 'width' on type 'Starship'" in str(result.errors[0])
+
+
+def test_lazy_schema_introspection():
+
+    query = "{ __schema { types { name } } }"
+
+    eager = make_schema(lazy=False).execute(query)
+    lazy = make_schema(lazy=True).execute(query)
+
+    assert lazy.errors is None
+
+    def get_names(result):
+        return sorted(t["name"] for t in result.data["__schema"]["types"])
+
+    assert get_names(lazy) == get_names(eager)
@@ -0,0 +1,58 @@
+import pytest
+
+from pyql import InputObject, Interface, NonNull, Object, Schema, Union
+from pyql.schema.types.core import Argument, Field, InputField, List
+
+
+def make_schema(num_fields):
+    Query = Object(
+        "Query", fields={"field_{}".format(i): str for i in range(num_fields)}
+    )
+    return Schema(query=Query)
+
+
+def test_memory_info():
+
+    schema = make_schema(10)
+
+    info = schema.memory_info()
+    assert info["definition"] > 0
+    assert info["compiled"] is None
+
+    schema.compiled
+
+    info = schema.memory_info()
+    assert info["definition"] > 0
+    assert info["compiled"] > 0
+
+
+def test_memory_info_grows_with_schema():
+
+    small = make_schema(10)
+    small.compiled
+    large = make_schema(100)
+    large.compiled
+
+    small_info = small.memory_info()
+    large_info = large.memory_info()
+
+    assert large_info["definition"] > small_info["definition"]
+    assert large_info["compiled"] > small_info["compiled"]
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        Object("Foo"),
+        Interface("Foo"),
+        InputObject("Foo"),
+        Union("Foo", []),
+        Field(str, None, None, None, None),
+        InputField(str),
+        Argument(str),
+        NonNull(str),
+        List(str),
+    ],
+)
+def test_definitions_have_no_instance_dict(obj):
+    assert not hasattr(obj, "__dict__")
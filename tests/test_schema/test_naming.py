@@ -0,0 +1,130 @@
+from typing import List
+
+import pytest
+
+from pyql import InputObject, Object, Schema
+from pyql.schema.naming import NamingStrategy, get_naming_strategy
+
+
+def make_schema(**kwargs):
+
+    PostFilter = InputObject("PostFilter", fields={"author_name": str, "tag": str})
+    PostFilter.fields["tag"].out_name = "tag_name"
+
+    Post = Object("Post", fields={"title": str, "author_name": str})
+
+    Query = Object("Query")
+
+    @Query.field("find_posts")
+    def resolve_find_posts(
+        root, info, post_filter: PostFilter, max_results: int = 10
+    ) -> List[Post]:
+        return [
+            Post(
+                title="{} ({})".format(post_filter.tag_name, max_results),
+                author_name=post_filter.author_name,
+            )
+        ]
+
+    return Schema(query=Query, **kwargs)
+
+
+def test_default_naming_is_camel_case():
+    schema = make_schema()
+
+    result = schema.execute("""
+        {
+            findPosts(postFilter: {authorName: "alice", tag: "news"}, maxResults: 2) {
+                title
+                authorName
+            }
+        }
+        """)
+
+    assert result.errors is None
+    assert result.data == {"findPosts": [{"title": "news (2)", "authorName": "alice"}]}
+
+
+def test_identity_naming():
+    schema = make_schema(naming="identity")
+
+    result = schema.execute("""
+        {
+            find_posts(
+                post_filter: {author_name: "alice", tag: "news"}, max_results: 2
+            ) {
+                title
+                author_name
+            }
+        }
+        """)
+
+    assert result.errors is None
+    assert result.data == {
+        "find_posts": [{"title": "news (2)", "author_name": "alice"}]
+    }
+
+
+def test_identity_naming_does_not_rename_arguments():
+    schema = make_schema(naming="identity")
+    field = schema.compiled.query_type.fields["find_posts"]
+    compiler = schema._compiler
+    pyfield = schema.query.fields["find_posts"]
+
+    # Arguments are used exactly as compiled, with no renaming
+    for name, arg in field.args.items():
+        assert arg.out_name is None
+        assert arg is compiler.compile_argument(pyfield.args[name])
+
+    input_type = schema.compiled.get_type("PostFilter")
+    assert input_type.fields["author_name"].out_name is None
+    assert input_type.fields["tag"].out_name == "tag_name"
+
+
+def test_custom_naming():
+    schema = make_schema(naming=str.upper)
+
+    result = schema.execute(
+        '{ FIND_POSTS(POST_FILTER: {AUTHOR_NAME: "bob", TAG: "x"}) { TITLE } }'
+    )
+
+    assert result.errors is None
+    assert result.data == {"FIND_POSTS": [{"TITLE": "x (10)"}]}
+
+
+def test_names_are_converted_once():
+    calls = []
+
+    def convert(name):
+        calls.append(name)
+        return name.replace("_", "")
+
+    naming = NamingStrategy("no_underscores", convert)
+    schema = make_schema(naming=naming)
+    schema.compiled
+
+    assert sorted(calls) == sorted(set(calls))
+    assert naming.to_graphql("author_name") == "authorname"
+    assert naming.to_python("authorname") == "author_name"
+    assert naming.to_python("unknown") == "unknown"
+
+    # Tables are kept across compilations
+    Other = Object("Other", fields={"other_field": str})
+    schema.query.define_field("other_thing", Other)
+    schema.compiled
+    assert sorted(calls) == sorted(set(calls))
+    assert "author_name" in calls and "other_field" in calls
+
+
+@pytest.mark.parametrize("naming", [None, "camel_case", "identity"])
+def test_get_builtin_naming_strategy(naming):
+    strategy = get_naming_strategy(naming)
+    assert strategy.name == (naming or "camel_case")
+    assert strategy.is_identity == (naming == "identity")
+
+
+def test_invalid_naming_strategy():
+    with pytest.raises(ValueError):
+        Schema(naming="kebab_case")
+    with pytest.raises(TypeError):
+        Schema(naming=42)
@@ -47,3 +47,18 @@ def test_objects_can_reference_each_other():
             "bar": {"name": "FOO bar", "foo": {"name": "FOO bar foo"}},
         }
     }
+
+
+def test_long_chains_of_nested_objects():
+
+    # Fields of nested types are compiled in a loop, not recursively
+    objects = [Object("Type{}".format(i), {"name": str}) for i in range(500)]
+    for obj, next_obj in zip(objects, objects[1:]):
+        obj.define_field("next", next_obj)
+
+    schema = Schema()
+    schema.query.define_field("first", objects[0])
+
+    compiled = schema.compiled
+    assert set(compiled.get_type("Type499").fields) == {"name"}
+    assert set(compiled.get_type("Type498").fields) == {"name", "next"}
@@ -0,0 +1,235 @@
+import decimal
+import uuid
+from typing import List
+
+import pytest
+from graphql import GraphQLScalarType
+
+from pyql import JSON, BigInt, NonNull, Schema
+
+UUID_VALUE = uuid.UUID("6ba7b810-9dad-11d1-80b4-00c04fd430c8")
+
+
+def make_echo_schema(pytype, **kwargs):
+
+    schema = Schema(**kwargs)
+
+    @schema.query.field("echo")
+    def resolve_echo(root, info, value: pytype) -> pytype:
+        return value
+
+    return schema
+
+
+@pytest.mark.parametrize(
+    "pytype,type_name,variable,expected",
+    [
+        (uuid.UUID, "UUID", str(UUID_VALUE), str(UUID_VALUE)),
+        (uuid.UUID, "UUID", UUID_VALUE.hex.upper(), str(UUID_VALUE)),
+        (decimal.Decimal, "Decimal", "1.10", "1.10"),
+        (decimal.Decimal, "Decimal", 0.1, "0.1"),
+        (decimal.Decimal, "Decimal", 42, "42"),
+        (BigInt, "BigInt", "123456789012345678901234567890", None),
+        (BigInt, "BigInt", 2**70, str(2**70)),
+        (bytes, "Bytes", "aGVsbG8=", "aGVsbG8="),
+        (bytes, "Bytes", "", ""),
+        (JSON, "JSON", {"a": [1, "b", None]}, {"a": [1, "b", None]}),
+        (JSON, "JSON", "foo", "foo"),
+    ],
+)
+def test_variable_round_trip(pytype, type_name, variable, expected):
+    schema = make_echo_schema(pytype)
+
+    result = schema.execute(
+        "query ($value: {}!) {{ echo(value: $value) }}".format(type_name),
+        variable_values={"value": variable},
+    )
+
+    assert result.errors is None
+    assert result.data == {"echo": variable if expected is None else expected}
+
+
+@pytest.mark.parametrize(
+    "pytype,literal,expected",
+    [
+        (uuid.UUID, '"{}"'.format(UUID_VALUE), str(UUID_VALUE)),
+        # No rounding through float
+        (decimal.Decimal, "0.30000000000000000001", "0.30000000000000000001"),
+        (decimal.Decimal, "12", "12"),
+        (decimal.Decimal, '"-1.5E+3"', "-1.5E+3"),
+        (BigInt, "123456789012345678901234567890", "123456789012345678901234567890"),
+        (BigInt, '"-5"', "-5"),
+        (bytes, '"AAEC/w=="', "AAEC/w=="),
+        (JSON, '{a: [1, 2.5, "x", true, null]}', {"a": [1, 2.5, "x", True, None]}),
+    ],
+)
+def test_literal_round_trip(pytype, literal, expected):
+    schema = make_echo_schema(pytype)
+
+    result = schema.execute("{{ echo(value: {}) }}".format(literal))
+
+    assert result.errors is None
+    assert result.data == {"echo": expected}
+
+
+@pytest.mark.parametrize(
+    "pytype,type_name,variable",
+    [
+        (uuid.UUID, "UUID", "not-a-uuid"),
+        (uuid.UUID, "UUID", 1234),
+        (decimal.Decimal, "Decimal", "abc"),
+        (decimal.Decimal, "Decimal", "NaN"),
+        (decimal.Decimal, "Decimal", float("nan")),
+        (decimal.Decimal, "Decimal", float("-inf")),
+        (decimal.Decimal, "Decimal", True),
+        (BigInt, "BigInt", "1.5"),
+        (BigInt, "BigInt", 1.5),
+        (bytes, "Bytes", "not base64!"),
+        (bytes, "Bytes", "aGVsbG8"),
+    ],
+)
+def test_invalid_variables(pytype, type_name, variable):
+    schema = make_echo_schema(pytype)
+
+    result = schema.execute(
+        "query ($value: {}!) {{ echo(value: $value) }}".format(type_name),
+        variable_values={"value": variable},
+    )
+
+    assert result.data is None
+    assert len(result.errors) == 1
+    assert result.errors[0].message.startswith("Variable '$value' got invalid value")
+    assert "{} cannot represent value".format(type_name) in result.errors[0].message
+
+
+@pytest.mark.parametrize(
+    "pytype,values,expected",
+    [
+        (uuid.UUID, [UUID_VALUE, UUID_VALUE], [str(UUID_VALUE)] * 2),
+        (
+            decimal.Decimal,
+            [decimal.Decimal("1.5"), decimal.Decimal("-0.01"), 3],
+            ["1.5", "-0.01", "3"],
+        ),
+        (BigInt, [1, 2**80, "3"], ["1", str(2**80), "3"]),
+        (bytes, [b"hello", bytearray(b"\x00")], ["aGVsbG8=", "AA=="]),
+        (JSON, [{"a": 1}, [1, 2], None], [{"a": 1}, [1, 2], None]),
+    ],
+)
+def test_serialize_lists(pytype, values, expected):
+
+    schema = Schema()
+
+    @schema.query.field("values")
+    def resolve_values(root, info) -> List[pytype]:
+        return values
+
+    result = schema.execute("{ values }")
+
+    assert result.errors is None
+    assert result.data == {"values": expected}
+
+
+@pytest.mark.parametrize(
+    "pytype,value",
+    [
+        (uuid.UUID, 1234),
+        (decimal.Decimal, decimal.Decimal("Infinity")),
+        (BigInt, True),
+        (bytes, "text"),
+    ],
+)
+def test_invalid_output_values(pytype, value):
+
+    schema = Schema()
+
+    @schema.query.field("value")
+    def resolve_value(root, info) -> NonNull(pytype):
+        return value
+
+    result = schema.execute("{ value }")
+
+    assert result.data is None
+    assert len(result.errors) == 1
+    assert "cannot represent value" in result.errors[0].message
+
+
+def test_invalid_list_item_is_reported():
+
+    schema = Schema()
+
+    @schema.query.field("values")
+    def resolve_values(root, info) -> List[decimal.Decimal]:
+        return [decimal.Decimal("1"), decimal.Decimal("NaN"), decimal.Decimal("2")]
+
+    result = schema.execute("{ values }")
+
+    assert result.data == {"values": ["1", None, "2"]}
+    assert len(result.errors) == 1
+    assert result.errors[0].path == ["values", 1]
+
+
+def test_register_scalar():
+
+    Money = GraphQLScalarType(
+        name="Money",
+        serialize=lambda value: "{:.2f} EUR".format(value),
+    )
+
+    schema = Schema(scalars={float: Money})
+
+    @schema.query.field("price")
+    def resolve_price(root, info) -> float:
+        return 12.5
+
+    @schema.query.field("amount")
+    def resolve_amount(root, info) -> decimal.Decimal:
+        return decimal.Decimal("3.50")
+
+    assert schema.execute("{ price amount }").data == {
+        "price": "12.50 EUR",
+        "amount": "3.50",
+    }
+
+    # Registering a scalar invalidates the compiled schema
+    schema.register_scalar(
+        decimal.Decimal,
+        GraphQLScalarType(name="Amount", serialize=float),
+    )
+
+    assert schema.execute("{ price amount }").data == {
+        "price": "12.50 EUR",
+        "amount": 3.5,
+    }
+    assert schema.compiled.get_type("Amount") is not None
+    assert schema.compiled.get_type("Decimal") is None
+
+
+def test_register_scalar_for_custom_class():
+
+    class Point:
+        def __init__(self, x, y):
+            self.x = x
+            self.y = y
+
+    schema = Schema()
+    schema.register_scalar(
+        Point,
+        GraphQLScalarType(
+            name="Point",
+            serialize=lambda point: [point.x, point.y],
+            parse_value=lambda value: Point(*value),
+        ),
+    )
+
+    @schema.query.field("move")
+    def resolve_move(root, info, point: Point, dx: int) -> Point:
+        return Point(point.x + dx, point.y)
+
+    result = schema.execute(
+        "query ($point: Point!) { move(point: $point, dx: 2) }",
+        variable_values={"point": [1, 2]},
+    )
+
+    assert result.errors is None
+    assert result.data == {"move": [3, 2]}
@@ -2,7 +2,7 @@ from typing import List
 
 from graphql import GraphQLError
 
-from pyql import Object, Schema
+from pyql import NonNull, Object, Schema
 
 
 def test_create_basic_schema():
@@ -180,3 +180,24 @@ def test_omitted_fields_are_filled_with_none():
 
     assert result.errors is None
     assert result.data == {"myObj": {"foo": "FOO", "bar": None}}
+
+
+def test_wrapping_types_are_shared():
+
+    schema = Schema()
+
+    @schema.query.field("hello")
+    def resolve_hello(root, info, name: str, greeting: str) -> NonNull(str):
+        return "{} {}".format(greeting, name)
+
+    @schema.query.field("tags")
+    def resolve_tags(root, info, tags: List[str]) -> List[str]:
+        return tags
+
+    compiled = schema.compile()
+    hello = compiled.query_type.fields["hello"]
+    tags = compiled.query_type.fields["tags"]
+
+    assert hello.type is hello.args["name"].type
+    assert hello.args["name"].type is hello.args["greeting"].type
+    assert tags.type is tags.args["tags"].type.of_type
@@ -1,8 +1,10 @@
 from enum import Enum
+from typing import List
 
 import pytest
 
-from pyql import Object, Schema
+from pyql import NonNull, Object, Schema
+from pyql.schema.types.enum_type import GraphQLEnumType
 
 
 class Color(Enum):
@@ -144,3 +146,92 @@ def test_instrospect_enum(sample_output_schema):
             ],
         }
     }
+
+
+class Priority(Enum):
+    # Not usable in schemas (enum value names can't be numbers), but
+    # good enough to test the enum type itself.
+    LOW = 1
+    HIGH = 2
+    URGENT = 2  # Alias
+
+
+class CustomColor(Enum):
+    RED = "red"
+
+    @classmethod
+    def _missing_(cls, value):
+        if value == "crimson":
+            return cls.RED
+
+
+def test_enum_list_output():
+
+    schema = Schema()
+
+    @schema.query.field("colors")
+    def resolve_colors(root, info) -> List[Color]:
+        return [Color.RED, Color.BLUE, Color.RED]
+
+    @schema.query.field("colors_with_null")
+    def resolve_colors_with_null(root, info) -> List[Color]:
+        return [Color.GREEN, None]
+
+    @schema.query.field("non_null_colors")
+    def resolve_non_null_colors(root, info) -> List[NonNull(Color)]:
+        return (Color.GREEN, Color.BLUE)
+
+    result = schema.execute("{ colors colorsWithNull nonNullColors }")
+
+    assert result.errors is None
+    assert result.data == {
+        "colors": ["red", "blue", "red"],
+        "colorsWithNull": ["green", None],
+        "nonNullColors": ["green", "blue"],
+    }
+
+
+def test_enum_list_invalid_item():
+
+    schema = Schema()
+
+    @schema.query.field("colors")
+    def resolve_colors(root, info) -> List[Color]:
+        return [Color.RED, "blue"]
+
+    result = schema.execute("{ colors }")
+
+    assert result.data == {"colors": ["red", None]}
+    assert len(result.errors) == 1
+    assert result.errors[0].path == ["colors", 1]
+
+
+def test_enum_missing_hook_is_used():
+
+    schema = Schema()
+
+    @schema.query.field("echo")
+    def resolve_echo(root, info, color: CustomColor) -> CustomColor:
+        return color
+
+    result = schema.execute(
+        "query ($c: CustomColor!) { echo(color: $c) }",
+        variable_values={"c": "crimson"},
+    )
+
+    assert result.errors is None
+    assert result.data == {"echo": "red"}
+
+
+def test_enum_type_tables_are_computed_once():
+
+    enum_type = GraphQLEnumType(enum=Priority)
+
+    assert enum_type.name == "Priority"
+    assert enum_type.values is enum_type.values
+    assert list(enum_type.values) == ["1", "2"]
+    assert dict(enum_type.members_by_name) == {"1": Priority.LOW, "2": Priority.HIGH}
+    assert dict(enum_type.members_by_value) == {1: Priority.LOW, 2: Priority.HIGH}
+
+    with pytest.raises(TypeError):
+        enum_type.values["3"] = None
@@ -1,3 +1,5 @@
+from typing import List
+
 import pytest
 
 from pyql import ID, InputObject, NonNull, Object, Schema
@@ -112,3 +114,59 @@ def test_field_names_can_be_camelcase_in_python():
 
     assert result.errors is None
     assert result.data == {"doSomething": "HELLO"}
+
+
+@pytest.mark.parametrize("slots", [False, True])
+def test_list_of_input_objects(slots):
+
+    ItemInput = InputObject(
+        "ItemInput",
+        fields={"item_name": NonNull(str), "item_count": int},
+        slots=slots,
+    )
+
+    Query = Object("Query", fields={"dummy": str})
+    Mutation = Object("Mutation")
+
+    @Mutation.field("import_items")
+    def resolve_import_items(root, info, items: List[ItemInput]) -> List[str]:
+        assert all(isinstance(item, ItemInput) for item in items)
+        return ["{} x {}".format(item.item_count, item.item_name) for item in items]
+
+    schema = Schema(query=Query, mutation=Mutation)
+
+    result = schema.execute(
+        """
+    mutation importItems($items: [ItemInput!]!) {
+      importItems(items: $items)
+    }
+    """,
+        variable_values={
+            "items": [
+                {"itemName": "Spam", "itemCount": 3},
+                {"itemName": "Eggs"},
+            ]
+        },
+    )
+
+    assert result.errors is None
+    assert result.data == {"importItems": ["3 x Spam", "None x Eggs"]}
+
+
+def test_input_field_out_name():
+
+    MyInput = InputObject("MyInput")
+    MyInput.define_field("some_field", str, out_name="other_name")
+
+    Query = Object("Query")
+
+    @Query.field("hello")
+    def resolve_hello(root, info, value: MyInput) -> str:
+        return value.other_name
+
+    schema = Schema(query=Query)
+
+    result = schema.execute('{ hello(value: {someField: "A VALUE"}) }')
+
+    assert result.errors is None
+    assert result.data == {"hello": "A VALUE"}
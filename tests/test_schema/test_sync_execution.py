@@ -0,0 +1,82 @@
+import asyncio
+import threading
+
+import pytest
+
+from pyql import Object, Schema
+
+
+def run_in_thread(fn):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(fn()))
+    thread.start()
+    thread.join()
+    return results[0]
+
+
+def test_sync_execution_does_not_use_asyncio(monkeypatch):
+
+    schema = Schema()
+
+    @schema.query.field("hello")
+    def resolve_hello(root, info) -> str:
+        return "Hello world"
+
+    def fail():
+        raise AssertionError("Should not get an event loop")
+
+    monkeypatch.setattr(asyncio, "get_event_loop", fail)
+
+    result = schema.execute("{ hello }")
+    assert result.errors is None
+    assert result.data == {"hello": "Hello world"}
+
+
+def test_sync_execution_from_thread_without_event_loop():
+
+    schema = Schema()
+
+    @schema.query.field("hello")
+    def resolve_hello(root, info) -> str:
+        return "Hello world"
+
+    result = run_in_thread(lambda: schema.execute("{ hello }"))
+    assert result.errors is None
+    assert result.data == {"hello": "Hello world"}
+
+
+def test_sync_execution_of_coroutine_resolvers():
+
+    schema = Schema()
+
+    Post = Object("Post", {"title": str})
+
+    @Post.field("body")
+    async def resolve_body(root, info) -> str:
+        return "Body of {}".format(root.title)
+
+    @schema.query.field("post")
+    def resolve_post(root, info) -> Post:
+        return Post(title="One")
+
+    result = schema.execute("{ post { title, body } }")
+    assert result.errors is None
+    assert result.data == {"post": {"title": "One", "body": "Body of One"}}
+
+
+@pytest.mark.filterwarnings("ignore:coroutine .* was never awaited")
+def test_sync_execution_fails_on_unexpected_awaitable():
+
+    schema = Schema()
+
+    async def get_hello():
+        return "Hello world"
+
+    @schema.query.field("hello")
+    def resolve_hello(root, info) -> str:
+        return get_hello()
+
+    with pytest.raises(RuntimeError) as excinfo:
+        schema.execute("{ hello }")
+
+    assert "failed to complete synchronously" in str(excinfo.value)
@@ -0,0 +1,157 @@
+import datetime
+from typing import List
+
+import aniso8601
+import pytest
+
+from pyql import NonNull, Schema
+from pyql.schema.types.extra import (
+    date_parse_value,
+    datetime_parse_value,
+    time_parse_value,
+)
+
+UTC = datetime.timezone.utc
+
+
+class CustomDateTime(datetime.datetime):
+    pass
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2018-12-11T14:28:00",
+        "2018-12-11T14:28",
+        "2018-12-11T14:28:00.123",
+        "2018-12-11T14:28:00.123456",
+        "2018-12-11T14:28:00Z",
+        "2018-12-11T14:28:00+02:00",
+        "2018-12-11T14:28:00.5-05:30",
+        # Not handled by fromisoformat() (on some Python versions)
+        "20181211T142800",
+        "2018-12-11T14:28:00.1234567",
+        "2018-W50-2T14:28:00",
+        "2018-12-11T14:28:00+0200",
+    ],
+)
+def test_datetime_parse_value(value):
+    assert datetime_parse_value(value) == aniso8601.parse_datetime(value)
+
+
+@pytest.mark.parametrize(
+    "value", ["2018-12-11", "20181211", "2018-W50-2", "2018-345", "2018-12"]
+)
+def test_date_parse_value(value):
+    assert date_parse_value(value) == aniso8601.parse_date(value)
+
+
+@pytest.mark.parametrize(
+    "value", ["14:28:00", "14:28", "14:28:00.123456", "14:28:00Z", "142800"]
+)
+def test_time_parse_value(value):
+    assert time_parse_value(value) == aniso8601.parse_time(value)
+
+
+@pytest.mark.parametrize(
+    "parse_value",
+    [datetime_parse_value, date_parse_value, time_parse_value],
+)
+@pytest.mark.parametrize("value", ["", "foo", "2018-13-45T25:61:00", "99:99", 1234])
+def test_invalid_values_are_parsed_as_null(parse_value, value):
+    assert parse_value(value) is None
+
+
+def test_temporal_variables():
+
+    schema = Schema()
+
+    @schema.query.field("echo")
+    def resolve_echo(
+        root, info, dt: datetime.datetime, d: datetime.date, t: datetime.time
+    ) -> str:
+        return "{!r} {!r} {!r}".format(dt, d, t)
+
+    result = schema.execute(
+        "query ($dt: DateTime!, $d: Date!, $t: Time!) "
+        "{ echo(dt: $dt, d: $d, t: $t) }",
+        variable_values={"dt": "2018-12-11T14:28:00", "d": "2018-12-11", "t": "14:28"},
+    )
+
+    assert result.errors is None
+    assert result.data == {
+        "echo": "datetime.datetime(2018, 12, 11, 14, 28) "
+        "datetime.date(2018, 12, 11) "
+        "datetime.time(14, 28)"
+    }
+
+
+@pytest.mark.parametrize(
+    "values,expected",
+    [
+        (
+            [datetime.datetime(2018, 12, 11, 14, 28), datetime.date(2018, 12, 12)],
+            ["2018-12-11T14:28:00", "2018-12-12"],
+        ),
+        (
+            (datetime.datetime(2018, 12, 11, 14, 28, tzinfo=UTC),),
+            ["2018-12-11T14:28:00+00:00"],
+        ),
+        # These go through the per-item path
+        (
+            [datetime.datetime(2018, 12, 11, 14, 28), None],
+            ["2018-12-11T14:28:00", None],
+        ),
+        ([CustomDateTime(2018, 12, 11, 14, 28)], ["2018-12-11T14:28:00"]),
+        ((dt for dt in [datetime.date(2018, 12, 11)]), ["2018-12-11"]),
+        ([], []),
+    ],
+)
+def test_serialize_list_of_datetimes(values, expected):
+
+    schema = Schema()
+
+    @schema.query.field("values")
+    def resolve_values(root, info) -> List[datetime.datetime]:
+        return values
+
+    result = schema.execute("{ values }")
+
+    assert result.errors is None
+    assert result.data == {"values": expected}
+
+
+def test_serialize_list_of_dates_and_times():
+
+    schema = Schema()
+
+    @schema.query.field("dates")
+    def resolve_dates(root, info) -> List[NonNull(datetime.date)]:
+        return [datetime.date(2018, 12, 11), datetime.datetime(2018, 12, 12, 10, 0)]
+
+    @schema.query.field("times")
+    def resolve_times(root, info) -> List[datetime.time]:
+        return [datetime.time(14, 28), datetime.time(9, 0, 0, 500)]
+
+    result = schema.execute("{ dates times }")
+
+    assert result.errors is None
+    assert result.data == {
+        "dates": ["2018-12-11", "2018-12-12"],
+        "times": ["14:28:00", "09:00:00.000500"],
+    }
+
+
+def test_invalid_list_item_is_reported():
+
+    schema = Schema()
+
+    @schema.query.field("values")
+    def resolve_values(root, info) -> List[datetime.datetime]:
+        return [datetime.datetime(2018, 12, 11, 14, 28), "not a datetime"]
+
+    result = schema.execute("{ values }")
+
+    assert result.data == {"values": ["2018-12-11T14:28:00", None]}
+    assert len(result.errors) == 1
+    assert result.errors[0].path == ["values", 1]
@@ -0,0 +1,115 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from pyql import Object, Schema
+
+
+def make_schema(**kwargs):
+
+    Item = Object("Item", {"name": str})
+
+    Query = Object("Query")
+
+    @Query.field("hello")
+    def resolve_hello(root, info, name: str = "world") -> str:
+        return "Hello {}".format(name)
+
+    @Query.field("items")
+    def resolve_items(root, info) -> List[Item]:
+        return [Item(name="foo"), Item(name="bar")]
+
+    @Query.field("fail")
+    def resolve_fail(root, info) -> str:
+        raise ValueError("Nope")
+
+    return Schema(query=Query, **kwargs)
+
+
+def get_resolvers(result):
+    return [
+        (
+            resolver["path"],
+            resolver["parentType"],
+            resolver["fieldName"],
+            resolver["returnType"],
+        )
+        for resolver in result.extensions["tracing"]["execution"]["resolvers"]
+    ]
+
+
+def test_resolvers_are_not_wrapped_without_tracing():
+    schema = make_schema()
+
+    field = schema.query.fields["hello"]
+    assert schema.compiled.query_type.fields["hello"].resolve is field.resolver
+
+    result = schema.execute("{ hello }")
+    assert result.extensions is None
+
+
+def test_resolvers_are_traced():
+    schema = make_schema(tracing=True)
+
+    result = schema.execute("{ hello items { name } fail }")
+    assert result.data == {
+        "hello": "Hello world",
+        "items": [{"name": "foo"}, {"name": "bar"}],
+        "fail": None,
+    }
+
+    assert get_resolvers(result) == [
+        (["hello"], "Query", "hello", "String"),
+        (["items"], "Query", "items", "[Item]"),
+        (["items", 0, "name"], "Item", "name", "String"),
+        (["items", 1, "name"], "Item", "name", "String"),
+        (["fail"], "Query", "fail", "String"),
+    ]
+
+    trace = result.extensions["tracing"]
+    assert trace["version"] == 1
+    assert trace["startTime"].endswith("Z")
+    assert trace["endTime"] >= trace["startTime"]
+
+    duration = trace["duration"]
+    for resolver in trace["execution"]["resolvers"]:
+        assert 0 <= resolver["startOffset"] <= duration
+        assert 0 <= resolver["duration"] <= duration
+
+
+def test_async_resolvers_are_traced():
+    schema = make_schema(tracing=True)
+
+    @schema.query.field("slow")
+    async def resolve_slow(root, info) -> str:
+        await asyncio.sleep(0.01)
+        return "done"
+
+    result = asyncio.run(schema.execute_async("{ hello slow }"))
+    assert result.data == {"hello": "Hello world", "slow": "done"}
+
+    resolvers = result.extensions["tracing"]["execution"]["resolvers"]
+    durations = {r["fieldName"]: r["duration"] for r in resolvers}
+    assert durations["slow"] >= 10_000_000
+    assert durations["hello"] < durations["slow"]
+
+
+@pytest.mark.parametrize(
+    "sample_rate,random_value,traced",
+    [(0, 0.0, False), (0.5, 0.2, True), (0.5, 0.7, False), (1, 0.99, True)],
+)
+def test_sampling(monkeypatch, sample_rate, random_value, traced):
+    monkeypatch.setattr("random.random", lambda: random_value)
+    schema = make_schema(tracing=True, tracing_sample_rate=sample_rate)
+
+    result = schema.execute("{ hello }")
+    assert result.data == {"hello": "Hello world"}
+    assert (result.extensions is not None) == traced
+
+
+def test_sample_rate_can_be_overridden_per_execution():
+    schema = make_schema(tracing=True, tracing_sample_rate=0)
+
+    result = schema.execute("{ hello }", tracing_sample_rate=1)
+    assert get_resolvers(result) == [(["hello"], "Query", "hello", "String")]
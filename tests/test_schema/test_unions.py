@@ -1,4 +1,4 @@
-from typing import Union
+from typing import List, Union
 
 import pytest
 
@@ -127,3 +127,88 @@ class Test_union_of_objects:
 
         assert result.errors is None
         assert result.data == {"action": {"ok": False, "errorMessage": "Action failed"}}
+
+
+def make_large_union_schema(num_members=50):
+    members = [Object("Member{}".format(i), {"value": int}) for i in range(num_members)]
+    Result = pyql.Union("Result", members)
+
+    schema = Schema()
+
+    @schema.query.field("results")
+    def resolve_results(root, info) -> List[Result]:
+        return [members[i](value=i) for i in (0, 17, 49, 17)]
+
+    return schema, members
+
+
+def test_union_members_resolved_via_container_types():
+
+    schema, members = make_large_union_schema()
+
+    result = schema.execute("{ results { __typename } }")
+
+    assert result.errors is None
+    assert result.data == {
+        "results": [
+            {"__typename": "Member0"},
+            {"__typename": "Member17"},
+            {"__typename": "Member49"},
+            {"__typename": "Member17"},
+        ]
+    }
+
+    assert schema._compiler.type_registry == {
+        members[i].container_type: "Member{}".format(i) for i in (0, 17, 49)
+    }
+
+
+def test_union_members_resolved_via_registered_classes():
+
+    Cat = Object("Cat", {"name": str})
+    Dog = Object("Dog", {"name": str})
+    Pet = pyql.Union("Pet", [Cat, Dog])
+
+    @Dog.register_class
+    class DogModel:
+        def __init__(self, name):
+            self.name = name
+
+    schema = Schema()
+
+    @schema.query.field("pet")
+    def resolve_pet(root, info) -> Pet:
+        return DogModel(name="Rex")
+
+    # Without registering the class, default is_type_of would accept
+    # the object as a Cat, as the first possible type.
+    result = schema.execute("{ pet { __typename, ... on Dog { name } } }")
+
+    assert result.errors is None
+    assert result.data == {"pet": {"__typename": "Dog", "name": "Rex"}}
+
+
+@pytest.mark.parametrize("strict_types", [True, False])
+def test_union_members_resolved_with_strict_types(strict_types):
+
+    Cat = Object("Cat", {"name": str})
+    Dog = Object("Dog", {"name": str})
+    Pet = pyql.Union("Pet", [Cat, Dog])
+
+    schema = Schema(strict_types=strict_types)
+
+    @schema.query.field("pets")
+    def resolve_pets(root, info) -> List[Pet]:
+        return [Dog(name="Rex"), Cat(name="Tom"), {"name": "Unknown"}]
+
+    result = schema.execute("{ pets { __typename, ... on Dog { name } } }")
+
+    assert result.errors is None
+    assert result.data == {
+        "pets": [
+            {"__typename": "Dog", "name": "Rex"},
+            {"__typename": "Cat"},
+            # Objects other than containers are accepted by the first type
+            {"__typename": "Cat"},
+        ]
+    }